@@ -1,5 +1,7 @@
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
@@ -29,6 +31,9 @@ class ScraperController:
         self.scrapers: Dict[str, BaseScraper] = {}
         self._scraping_progress = {}
         self._scraping_logs = []
+        # Sources run on separate threads and all report into the two structures above
+        self._state_lock = threading.Lock()
+        self._scraping_in_progress = False
         self.is_scraping = False
         
         # Initialize scrapers for enabled news sources
@@ -98,6 +103,10 @@ class ScraperController:
         
         # Add more scrapers for other news sources here
         
+        # Scrapers report their progress and logs back to this controller
+        for scraper in self.scrapers.values():
+            scraper.controller = self
+        
         logger.info(f"Scrapers initialized: {list(self.scrapers.keys())}")
         
     def run_scraper(self, source_name: str) -> List[Dict[str, Any]]:
@@ -138,13 +147,20 @@ class ScraperController:
                     # Add log entry to scraping logs if available
                     if hasattr(self, "_scraping_logs"):
                         log_message = f"Sending article to API: '{title}' ({source_url})"
-                        self._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                        self.add_log(log_message)
                         
                     # Send the article (only once, right here)
                     response = self.api_client.post_news_data(article)
                     
-                    # Log success with response details
-                    logger.info(f"Successfully sent article: '{title}' - Response: {response}")
+                    if isinstance(response, dict) and response.get('exists'):
+                        logger.info(f"Article already stored, skipping: '{title}' - {source_url}")
+                        if hasattr(self, "_scraping_logs"):
+                            log_message = f"Skipping article (already exists in API): '{title}' ({source_url})"
+                            self.add_log(log_message)
+                        continue
+                    
+                    # Log success
+                    logger.info(f"Successfully sent article: '{title}' - {source_url}")
                     
                     # Add to successful articles list
                     successful_articles.append(article)
@@ -152,7 +168,7 @@ class ScraperController:
                     # Add success log entry
                     if hasattr(self, "_scraping_logs"):
                         log_message = f"✅ ARTICLE POSTED SUCCESSFULLY: '{title}' ({source_url})"
-                        self._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                        self.add_log(log_message)
                         
                 except Exception as e:
                     title = article.get('title', 'Unknown')
@@ -163,7 +179,7 @@ class ScraperController:
                     # Add failure log entry with detailed error
                     if hasattr(self, "_scraping_logs"):
                         log_message = f"❌ ARTICLE POST FAILED: '{title}' ({source_url}) - Error: {str(e)}"
-                        self._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                        self.add_log(log_message)
             
             logger.info(f"Scraper for {source_name} completed. Processed and sent {len(successful_articles)} articles out of {len(collected_articles)} collected.")
             
@@ -183,60 +199,39 @@ class ScraperController:
         results = {}
         total_articles = 0
         
-        # Reset progress tracking
-        for source_name in self.scrapers:
-            self._scraping_progress[source_name] = {
-                "status": "running",
-                "progress": 0,
-                "start_time": datetime.now().isoformat(),
-                "articles_found": 0,
-                "articles_processed": 0
-            }
+        with self._state_lock:
+            # Reset progress tracking
+            for source_name in self.scrapers:
+                self._scraping_progress[source_name] = {
+                    "status": "running",
+                    "progress": 0,
+                    "start_time": datetime.now().isoformat(),
+                    "articles_found": 0,
+                    "articles_processed": 0
+                }
+            
+            # Reset logs
+            self._scraping_logs = []
+        self.add_log("Starting scraping for all enabled sources")
         
-        # Reset logs
-        self._scraping_logs = []
-        self._scraping_logs.append(f"[{datetime.now().isoformat()}] Starting scraping for all enabled sources")
+        # Each source runs on its own thread, so one site's network waits overlap with
+        # another's; progress and log writes go through the lock-guarded helpers below
+        if self.scrapers:
+            with ThreadPoolExecutor(max_workers=len(self.scrapers), thread_name_prefix='scraper') as executor:
+                articles_by_source = dict(zip(self.scrapers, executor.map(self._run_source, self.scrapers)))
+        else:
+            articles_by_source = {}
         
-        for source_name in self.scrapers:
-            try:
-                logger.info(f"Running scraper for {source_name}")
-                self._scraping_logs.append(f"[{datetime.now().isoformat()}] Starting scraper for {source_name}")
-                
-                # Run the scraper (which now processes and saves articles one by one)
-                articles = self.run_scraper(source_name)
-                results[source_name] = articles
-                
-                # Count total articles for summary
-                if articles and len(articles) > 0:
-                    total_articles += len(articles)
-                    
-                self._scraping_logs.append(f"[{datetime.now().isoformat()}] Completed scraper for {source_name}, found and saved {len(articles)} articles")
-                
-                # Update progress to show completed status with end_time
-                self._scraping_progress[source_name].update({
-                    "status": "completed",
-                    "progress": 100,
-                    "articles_processed": len(articles) if articles else 0,
-                    "end_time": datetime.now().isoformat()
-                })
-                
-            except Exception as e:
-                logger.error(f"Error running scraper for {source_name}: {e}")
-                results[source_name] = []
-                
-                self._scraping_logs.append(f"[{datetime.now().isoformat()}] Error running scraper for {source_name}: {e}")
-                
-                # Update progress to show error status
-                self._scraping_progress[source_name].update({
-                    "status": "error",
-                    "progress": 0,
-                    "error": str(e),
-                    "end_time": datetime.now().isoformat()  # Also set end_time on error
-                })
+        for source_name, articles in articles_by_source.items():
+            results[source_name] = articles
+            
+            # Count total articles for summary
+            if articles and len(articles) > 0:
+                total_articles += len(articles)
         
         # Log summary of the entire run
         logger.info(f"Run completed for all scrapers. Total articles processed and saved: {total_articles}")
-        self._scraping_logs.append(f"[{datetime.now().isoformat()}] All scrapers completed. Total articles processed and saved: {total_articles}")
+        self.add_log(f"All scrapers completed. Total articles processed and saved: {total_articles}")
         
         # Store last run timestamp for persistence between runs
         self._last_scrape_results = {
@@ -246,6 +241,49 @@ class ScraperController:
         
         return results
     
+    def _run_source(self, source_name: str) -> List[Dict[str, Any]]:
+        """
+        Run one scraper as part of run_all_scrapers, recording its progress and logs.
+        
+        Args:
+            source_name: Name of the news source to scrape
+            
+        Returns:
+            List of articles that were successfully saved
+        """
+        try:
+            logger.info(f"Running scraper for {source_name}")
+            self.add_log(f"Starting scraper for {source_name}")
+            
+            # Run the scraper (which now processes and saves articles one by one)
+            articles = self.run_scraper(source_name)
+            
+            self.add_log(f"Completed scraper for {source_name}, found and saved {len(articles)} articles")
+            
+            # Update progress to show completed status with end_time
+            self.update_progress(source_name, {
+                "status": "completed",
+                "progress": 100,
+                "articles_processed": len(articles) if articles else 0,
+                "end_time": datetime.now().isoformat()
+            })
+            
+        except Exception as e:
+            logger.error(f"Error running scraper for {source_name}: {e}")
+            articles = []
+            
+            self.add_log(f"Error running scraper for {source_name}: {e}")
+            
+            # Update progress to show error status
+            self.update_progress(source_name, {
+                "status": "error",
+                "progress": 0,
+                "error": str(e),
+                "end_time": datetime.now().isoformat()  # Also set end_time on error
+            })
+        
+        return articles
+    
     def schedule_scrapers(self, start_now: bool = False):
         """
         Schedule all scrapers to run periodically.
@@ -265,6 +303,71 @@ class ScraperController:
         
         logger.info(f"Scheduled all scrapers to run every {settings.SCHEDULER_INTERVAL_HOURS} hours (job_id: {job_id})")
 
+    def start_scraping(self) -> bool:
+        """
+        Mark a manually triggered run as in progress, clearing the previous run's progress
+        and logs. Checking and setting the flag happen under the state lock, so two
+        concurrent triggers cannot both start.
+        
+        Returns:
+            True if the run was started, False if one is already in progress
+        """
+        with self._state_lock:
+            if self._scraping_in_progress:
+                return False
+            self._scraping_in_progress = True
+            self._scraping_progress = {}
+            self._scraping_logs = []
+            self._scraping_start_time = datetime.now()
+            return True
+    
+    def finish_scraping(self) -> None:
+        """Mark the manually triggered run as no longer in progress."""
+        with self._state_lock:
+            self._scraping_in_progress = False
+    
+    def init_progress(self, source_name: str) -> None:
+        """
+        Create a fresh running progress entry for a source.
+        
+        Args:
+            source_name: Name of the news source
+        """
+        with self._state_lock:
+            self._scraping_progress[source_name] = {
+                "status": "running",
+                "progress": 0,
+                "articles_found": 0,
+                "articles_processed": 0,
+                "start_time": datetime.now().isoformat(),
+                "elapsed_time": "0s"
+            }
+    
+    def add_log(self, message: str) -> None:
+        """
+        Append a timestamped entry to the scraping logs.
+        Safe to call from the scraper threads.
+        
+        Args:
+            message: The log message
+        """
+        with self._state_lock:
+            self._scraping_logs.append(f"[{datetime.now().isoformat()}] {message}")
+    
+    def update_progress(self, source_name: str, fields: Dict[str, Any]) -> None:
+        """
+        Merge fields into a source's progress entry, if it has one.
+        Safe to call from the scraper threads.
+        
+        Args:
+            source_name: Name of the news source
+            fields: Progress fields to set
+        """
+        with self._state_lock:
+            progress = self._scraping_progress.get(source_name)
+            if progress is not None:
+                progress.update(fields)
+    
     def get_scraping_progress(self) -> Dict[str, Any]:
         """
         Get the current scraping progress.
@@ -272,7 +375,8 @@ class ScraperController:
         Returns:
             Dictionary with scraping progress information
         """
-        return self._scraping_progress
+        with self._state_lock:
+            return {source: dict(progress) for source, progress in self._scraping_progress.items()}
         
     def get_scraping_logs(self) -> List[str]:
         """
@@ -281,7 +385,8 @@ class ScraperController:
         Returns:
             List of log entries
         """
-        return self._scraping_logs
+        with self._state_lock:
+            return list(self._scraping_logs)
 
 # Create a singleton instance
 scraper_controller = ScraperController() 
\ No newline at end of file
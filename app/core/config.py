@@ -1,4 +1,5 @@
 import os
+import re
 from pathlib import Path
 from dotenv import load_dotenv
 from typing import Dict, List, Optional, Any
@@ -37,12 +38,22 @@ class Settings(BaseSettings):
     # Article Configuration
     ARTICLE_DELAY_SECONDS: int = int(os.getenv("ARTICLE_DELAY_SECONDS", "20"))
     MAX_AGE_DAYS: int = int(os.getenv("MAX_AGE_DAYS", "3"))
+    # Only read by the manual app/test_arzdigital.py script, to cap its concurrent article fetches
+    FETCH_WORKERS: int = int(os.getenv("FETCH_WORKERS", "4"))
+    IMAGE_UPLOAD_WORKERS: int = int(os.getenv("IMAGE_UPLOAD_WORKERS", "8"))
+
+    # Image resizing: Pillow filter name (NEAREST, BOX, BILINEAR, HAMMING, BICUBIC, LANCZOS)
+    # and the reducing_gap for the cheap pre-reduction step (0 disables it)
+    IMAGE_RESAMPLE: str = os.getenv("IMAGE_RESAMPLE", "LANCZOS")
+    IMAGE_REDUCING_GAP: float = float(os.getenv("IMAGE_REDUCING_GAP", "2.0"))
 
     # News Sources - Simple field, not trying to parse as JSON
     ENABLED_SOURCES_STR: str = os.getenv("ENABLED_SOURCES", "mihan_blockchain,arzdigital,defier")
 
     # User Agent
     USER_AGENT: str = os.getenv("USER_AGENT", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36")
+    # Optional comma-separated pool of user agents rotated across image downloads
+    USER_AGENTS_STR: str = os.getenv("USER_AGENTS", "")
     
     # Persian month mapping
     PERSIAN_MONTHS: Dict[str, int] = PERSIAN_MONTHS
@@ -83,6 +94,12 @@ class Settings(BaseSettings):
             return []
         return [s.strip() for s in self.ENABLED_SOURCES_STR.split(",")]
     
+    def get_user_agents(self) -> List[str]:
+        """Get the user agents to rotate through, falling back to USER_AGENT."""
+        # Split only on commas not followed by a space; "KHTML, like Gecko" stays intact
+        user_agents = [ua.strip() for ua in re.split(r",(?!\s)", self.USER_AGENTS_STR) if ua.strip()]
+        return user_agents or [self.USER_AGENT]
+    
     @property
     def log_dir(self) -> Path:
         """Get the log directory path."""
@@ -22,6 +22,9 @@ class ArticleContentModel(BaseModel):
     creator: str
     title: str
     thumbnail_image: Optional[str] = None
+    # Parsed article body from the page fetch, reused instead of re-parsing `data`;
+    # kept in memory only and never serialized
+    body: Any = Field(default=None, exclude=True, repr=False)
     
 class ArticleFullModel(BaseModel):
     """Model for fully processed article data."""
@@ -45,9 +45,10 @@ async def get_scraper_status() -> Dict[str, Any]:
         
         # Get last run times for each scraper
         last_run_times = {}
+        scraping_progress = scraper_controller.get_scraping_progress()
         for source_name in scraper_controller.scrapers.keys():
             # Get scraper progress data if available
-            progress_data = scraper_controller._scraping_progress.get(source_name, {})
+            progress_data = scraping_progress.get(source_name, {})
             if progress_data and progress_data.get("end_time"):
                 last_run_times[source_name] = progress_data.get("end_time")
             elif hasattr(scraper_controller, "_last_scrape_results") and scraper_controller._last_scrape_results:
@@ -58,7 +59,7 @@ async def get_scraper_status() -> Dict[str, Any]:
             if progress_data and progress_data.get("status") == "completed" and not progress_data.get("end_time"):
                 # Add end_time if missing but status is completed
                 progress_data["end_time"] = datetime.now().isoformat()
-                scraper_controller._scraping_progress[source_name] = progress_data
+                scraper_controller.update_progress(source_name, {"end_time": progress_data["end_time"]})
                 last_run_times[source_name] = progress_data["end_time"]
         
         return {
@@ -77,8 +78,8 @@ async def get_scraping_progress() -> Dict[str, Any]:
     """Get the current progress of any ongoing scraping operations."""
     try:
         # Get the current progress
-        progress_data = getattr(scraper_controller, "_scraping_progress", None)
-        logs = getattr(scraper_controller, "_scraping_logs", [])
+        progress_data = scraper_controller.get_scraping_progress()
+        logs = scraper_controller.get_scraping_logs()
         is_scraping = hasattr(scraper_controller, "_scraping_in_progress") and scraper_controller._scraping_in_progress
         
         if not progress_data:
@@ -134,22 +135,16 @@ async def get_scraping_progress() -> Dict[str, Any]:
 async def trigger_scraping(source: str = None) -> Dict[str, Any]:
     """Manually trigger scraping for all sources or a specific source."""
     try:
-        # Check if scraping is already in progress
-        if hasattr(scraper_controller, "_scraping_in_progress") and scraper_controller._scraping_in_progress:
+        # Set the scraping in progress flag, unless scraping is already in progress
+        if not scraper_controller.start_scraping():
             return {
                 "status": "already_running",
                 "message": "A scraping process is already in progress. Please wait for it to complete."
             }
         
-        # Set scraping in progress flag
-        scraper_controller._scraping_in_progress = True
-        scraper_controller._scraping_progress = {}
-        scraper_controller._scraping_logs = []
-        scraper_controller._scraping_start_time = datetime.now()
-        
         # Add initial log
         log_message = f"Starting scraping process for {source or 'all sources'}"
-        scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+        scraper_controller.add_log(log_message)
         
         results = {}
         
@@ -158,14 +153,7 @@ async def trigger_scraping(source: str = None) -> Dict[str, Any]:
                 raise HTTPException(status_code=404, detail=f"Source {source} not found")
             
             # Initialize progress for this source
-            scraper_controller._scraping_progress[source] = {
-                "status": "running",
-                "progress": 0,
-                "articles_found": 0,
-                "articles_processed": 0,
-                "start_time": datetime.now().isoformat(),
-                "elapsed_time": "0s"
-            }
+            scraper_controller.init_progress(source)
             
             results = {source: []}
             try:
@@ -173,7 +161,7 @@ async def trigger_scraping(source: str = None) -> Dict[str, Any]:
                 results[source] = articles if articles else []
                 
                 # Update progress to completed
-                scraper_controller._scraping_progress[source].update({
+                scraper_controller.update_progress(source, {
                     "status": "completed",
                     "progress": 100,
                     "articles_processed": len(results[source]),
@@ -192,10 +180,10 @@ async def trigger_scraping(source: str = None) -> Dict[str, Any]:
                 # Send articles to API
                 if articles and len(articles) > 0:
                     log_message = f"Processed {len(articles)} articles for {source} - these were sent to API during processing"
-                    scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                    scraper_controller.add_log(log_message)
                     
                     # Add API results to the progress data - these are articles that were successfully sent
-                    scraper_controller._scraping_progress[source].update({
+                    scraper_controller.update_progress(source, {
                         "api_results": {
                             "successful": len(articles),
                             "failed": 0,
@@ -204,13 +192,13 @@ async def trigger_scraping(source: str = None) -> Dict[str, Any]:
                     })
                 else:
                     log_message = f"No articles found or processed for {source}"
-                    scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                    scraper_controller.add_log(log_message)
                 
             except Exception as e:
                 results[source] = {"error": str(e)}
                 
                 # Update progress with error
-                scraper_controller._scraping_progress[source].update({
+                scraper_controller.update_progress(source, {
                     "status": "error",
                     "progress": 0,
                     "error": str(e),
@@ -221,25 +209,18 @@ async def trigger_scraping(source: str = None) -> Dict[str, Any]:
             # Run all scrapers
             for scraper_name in scraper_controller.scrapers.keys():
                 # Initialize progress for this source
-                scraper_controller._scraping_progress[scraper_name] = {
-                    "status": "running",
-                    "progress": 0,
-                    "articles_found": 0,
-                    "articles_processed": 0,
-                    "start_time": datetime.now().isoformat(),
-                    "elapsed_time": "0s"
-                }
+                scraper_controller.init_progress(scraper_name)
                 
                 results[scraper_name] = []
                 try:
                     log_message = f"Starting scraping for {scraper_name}"
-                    scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                    scraper_controller.add_log(log_message)
                     
                     articles = scraper_controller.run_scraper(scraper_name)
                     results[scraper_name] = articles if articles else []
                     
                     # Update progress to completed
-                    scraper_controller._scraping_progress[scraper_name].update({
+                    scraper_controller.update_progress(scraper_name, {
                         "status": "completed",
                         "progress": 100,
                         "articles_processed": len(results[scraper_name]),
@@ -247,15 +228,15 @@ async def trigger_scraping(source: str = None) -> Dict[str, Any]:
                     })
                     
                     log_message = f"Completed scraping for {scraper_name}, found {len(results[scraper_name])} articles"
-                    scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                    scraper_controller.add_log(log_message)
                     
                     # Send articles to API
                     if results[scraper_name] and len(results[scraper_name]) > 0:
                         log_message = f"Processed {len(results[scraper_name])} articles for {scraper_name} - these were sent to API during processing"
-                        scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                        scraper_controller.add_log(log_message)
                         
                         # Add API results to the progress data - these are articles that were successfully sent
-                        scraper_controller._scraping_progress[scraper_name].update({
+                        scraper_controller.update_progress(scraper_name, {
                             "api_results": {
                                 "successful": len(results[scraper_name]),
                                 "failed": 0,
@@ -264,13 +245,13 @@ async def trigger_scraping(source: str = None) -> Dict[str, Any]:
                         })
                     else:
                         log_message = f"No articles found or processed for {scraper_name}"
-                        scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                        scraper_controller.add_log(log_message)
                     
                 except Exception as e:
                     results[scraper_name] = {"error": str(e)}
                     
                     # Update progress with error
-                    scraper_controller._scraping_progress[scraper_name].update({
+                    scraper_controller.update_progress(scraper_name, {
                         "status": "error",
                         "progress": 0,
                         "error": str(e),
@@ -278,7 +259,7 @@ async def trigger_scraping(source: str = None) -> Dict[str, Any]:
                     })
                     
                     log_message = f"Error scraping {scraper_name}: {str(e)}"
-                    scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                    scraper_controller.add_log(log_message)
         
         # Store results for monitoring
         scraper_controller._last_scrape_results = {
@@ -287,9 +268,9 @@ async def trigger_scraping(source: str = None) -> Dict[str, Any]:
         }
         
         # Set scraping completed
-        scraper_controller._scraping_in_progress = False
+        scraper_controller.finish_scraping()
         log_message = "Scraping process completed"
-        scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+        scraper_controller.add_log(log_message)
         
         return {
             "status": "success",
@@ -299,10 +280,9 @@ async def trigger_scraping(source: str = None) -> Dict[str, Any]:
         }
     except Exception as e:
         # Set scraping not in progress on error
-        scraper_controller._scraping_in_progress = False
+        scraper_controller.finish_scraping()
         log_message = f"Scraping process failed: {str(e)}"
-        if hasattr(scraper_controller, "_scraping_logs"):
-            scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+        scraper_controller.add_log(log_message)
         
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -352,8 +332,8 @@ async def get_scraping_stats() -> Dict[str, Any]:
                 
                 # Get last run time
                 last_run = None
-                if hasattr(scraper_controller, "_scraping_progress") and source in scraper_controller._scraping_progress:
-                    progress_data = scraper_controller._scraping_progress.get(source, {})
+                progress_data = scraper_controller.get_scraping_progress().get(source)
+                if progress_data:
                     if progress_data.get("end_time"):
                         last_run = progress_data.get("end_time")
                 
@@ -3,7 +3,8 @@ import re
 from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime, timedelta, timezone
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+from lxml import etree, html as lxml_html
 from persiantools.jdatetime import JalaliDateTime
 
 from app.core.config import settings
@@ -13,12 +14,39 @@ from app.services.api_client import APIClient
 
 logger = logging.getLogger(__name__)
 
+# Tags that fix_html_paragraphs cares about; group 2 marks closing tags, group 3 is the tag name
+_FIX_TAG_RE = re.compile(
+    r'(<\s*(/)?\s*(p|h[1-6]|figure|blockquote)\b[^>]*>)',
+    re.IGNORECASE
+)
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements that carry the given class token."""
+    return f'[contains(concat(" ", normalize-space(@class), " "), " {name} ")]'
+
+# Tag labels in the breadcrumb path, compiled once; the first one is the section, not a tag
+_TAGS_XPATH = etree.XPath(
+    '//div' + _has_class('arz-breaking-news-post__path') +
+    '/div' + _has_class('arz-path') +
+    '/ul' + _has_class('arz-path-list') +
+    '/li' + _has_class('arz-path__item') +
+    '/a' + _has_class('arz-path-link') +
+    '/span' + _has_class('arz-path-text')
+)
+
+# Opening tags that implicitly end an open <p>
+_P_TRIGGER_TAGS = frozenset({'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'figure', 'blockquote'})
+
 class ArzDigitalScraper(BaseScraper):
     """
     Scraper for ArzDigital news website.
     """
+
+    # lxml's C tree builder parses the listing pages several times faster than html.parser;
+    # article pages and bodies keep ARTICLE_PARSER so a <div> inside a <p> is not split off
+    PARSER = 'lxml'
     
-    def __init__(self, api_client=APIClient, max_age_days: int = 3):
+    def __init__(self, api_client: Optional[APIClient] = None, max_age_days: int = 3):
         """
         Initialize the ArzDigital scraper.
         
@@ -26,9 +54,7 @@ class ArzDigitalScraper(BaseScraper):
             api_client: API client for sending data
             max_age_days: Maximum age of articles to scrape in days
         """
-        super().__init__("ArzDigital", max_age_days)
-        if api_client:
-            self.api_client = api_client
+        super().__init__("ArzDigital", max_age_days, api_client)
         
     def get_article_links(self, url: str) -> List[ArticleLinkModel]:
         """
@@ -105,7 +131,7 @@ class ArzDigitalScraper(BaseScraper):
         """
         Get article content from a ArzDigital article page.
         """
-        soup = self.get_soup(url)
+        soup = self.get_soup(url, parser=self.ARTICLE_PARSER)
         
     
         if not soup:
@@ -118,8 +144,6 @@ class ArzDigitalScraper(BaseScraper):
             if not data:
                 logger.error(f"Could not find content div for article: {url}")
                 return None
-            
-            data_html = data.decode_contents()
 
             # Extract the creator
             creator = soup.select_one('section > a.arz-tw-text-sm')
@@ -130,7 +154,7 @@ class ArzDigitalScraper(BaseScraper):
             title_text = title.get_text(strip=True) if title else "N/A"
             
             # Extract thumbnail image here
-            thumbnail_image = self.extract_thumbnail_image(data_html)
+            thumbnail_image = self.extract_thumbnail_image(data)
             logger.info(f"Extracted thumbnail in get_article_content: {thumbnail_image}")
             data = soup.select_one('section.arz-container.arz-breaking-news-post')
             data_html = data.decode_contents()
@@ -164,27 +188,24 @@ class ArzDigitalScraper(BaseScraper):
                 logger.error(f"No HTML content found for article: {article.link}")
                 return None
             
-            # Upload thumbnail image
-            uploaded_thumbnail_url = None
-            if article.thumbnail_image:
-                logger.info(f"Uploading thumbnail: {article.thumbnail_image}")
-                uploaded_thumbnail_url = self.api_client.upload_image(article.thumbnail_image)
-                logger.info(f"Thumbnail uploaded to: {uploaded_thumbnail_url}")
-            else:
+            if not article.thumbnail_image:
                 logger.warning(f"No thumbnail found to upload for {article.link}")
             
             # Extract and process images
             html_with_placeholders, images = self.extract_and_replace_images(html_content)
             
-            # Upload additional images and update their URLs
+            # Upload the thumbnail and the article images together, in parallel
+            image_urls = [img_data['url'] for img_data in images if img_data.get('url')]
+            thumbnail_urls = [article.thumbnail_image] if article.thumbnail_image else []
+            logger.info(f"Uploading {len(thumbnail_urls) + len(image_urls)} images for {article.link}")
+            uploaded_urls = iter(self.upload_images(thumbnail_urls + image_urls))
+            uploaded_thumbnail_url = next(uploaded_urls) if thumbnail_urls else None
+            
+            # Update the image URLs with the uploaded ones
             uploaded_images = []
             for img_data in images:
-                original_url = img_data.get('url')
-                if original_url:
-                    logger.info(f"Uploading image: {original_url}")
-                    new_url = self.api_client.upload_image(original_url)
-                    logger.info(f"Image uploaded to: {new_url}")
-                    img_data['url'] = new_url  # Update the URL in the dictionary
+                if img_data.get('url'):
+                    img_data['url'] = next(uploaded_urls)  # Update the URL in the dictionary
                 else:
                     logger.warning(f"Image data missing URL: {img_data}")
                 uploaded_images.append(img_data)
@@ -228,12 +249,10 @@ class ArzDigitalScraper(BaseScraper):
             logger.error(f"Error processing article content for {article.link}: {e}")
             return None
             
-    def extract_thumbnail_image(self, html: str) -> Optional[str]:
+    def extract_thumbnail_image(self, soup: Tag) -> Optional[str]:
         """
-        Extract the thumbnail image from the article HTML.
+        Extract the thumbnail image from the already-parsed article element.
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        
         # Look for the thumbnail image
         try:
             # First try to find the featured image
@@ -262,7 +281,7 @@ class ArzDigitalScraper(BaseScraper):
         Cleans extra whitespace and ignores empty paragraphs.
         """
         html = self.fix_html_paragraphs(html)
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, self.ARTICLE_PARSER)
         content_elements = {}
 
         content_container = soup.select_one('article > section > div.arz-post__content')
@@ -272,8 +291,7 @@ class ArzDigitalScraper(BaseScraper):
         p_counter = 0
 
         for p in content_container.find_all('p', recursive=True):
-            text = p.get_text(separator=" ", strip=True)
-            text = re.sub(r'\s+', ' ', text).strip()
+            text = ' '.join(p.get_text(separator=" ").split())
 
             if not text:
                 continue
@@ -292,36 +310,32 @@ class ArzDigitalScraper(BaseScraper):
         Returns:
             List of tags
         """
-        soup = BeautifulSoup(html, 'html.parser')
         tags = []
+        seen = set()
 
         try:
-            # Find all tag elements along the given path
-            tag_elements = soup.select(
-                'div.arz-breaking-news-post__path > div.arz-path > ul.arz-path-list > li.arz-path__item > a.arz-path-link > span.arz-path-text'
-            )
+            # Only the breadcrumb is needed, so query lxml directly instead of building a soup
+            tag_elements = _TAGS_XPATH(lxml_html.fromstring(html))
 
             # Skip first 2 and last
             relevant_tags = tag_elements[1:]
 
             for tag in relevant_tags:
-                tag_text = tag.get_text(strip=True)
-                if tag_text and tag_text not in tags:
+                tag_text = tag.text_content().strip()
+                if tag_text and tag_text not in seen:
+                    seen.add(tag_text)
                     tags.append(tag_text)
+                    # Limit to a maximum of 10 tags
+                    if len(tags) == 10:
+                        break
 
-            # Limit to a maximum of 10 tags
-            return tags[:10]
+            return tags
 
         except Exception as e:
             logger.error(f"Error extracting tags: {e}")
             return []
     
 
-    def is_in_excluded_container(self, html: str, position: int) -> bool:
-        """
-        right now arzdigital has no excluded containers
-        """
-        pass
     def fix_html_paragraphs(self,html_content: str) -> str:
         """
         Processes the HTML content to ensure that if a <p> tag is open and one of the following
@@ -336,16 +350,11 @@ class ArzDigitalScraper(BaseScraper):
         """
         # This pattern matches any HTML tag for p, h1-h6, figure, or blockquote.
         # It captures whether the tag is closing (group 2) and its tag type (group 3).
-        pattern = re.compile(
-            r'(<\s*(/)?\s*(p|h[1-6]|figure|blockquote)\b[^>]*>)', 
-            re.IGNORECASE
-        )
-        
         result = []
         last_index = 0
         p_opened = False
 
-        for match in pattern.finditer(html_content):
+        for match in _FIX_TAG_RE.finditer(html_content):
             full_tag = match.group(1)      # The full matched tag
             is_closing = bool(match.group(2))  # True if it's a closing tag (e.g. </p>)
             tag_type = match.group(3).lower()  # The tag type, e.g., 'p', 'h1', etc.
@@ -356,10 +365,9 @@ class ArzDigitalScraper(BaseScraper):
             
             # If we encounter an opening tag (not a closing tag) that is one of our triggers,
             # and if there's an open <p> that hasn't been closed yet, insert a closing </p>.
-            if not is_closing and tag_type in ('p', 'figure', 'blockquote') or (not is_closing and tag_type.startswith('h')):
-                if p_opened:
-                    result.append('</p>')
-                    p_opened = False
+            if p_opened and not is_closing and tag_type in _P_TRIGGER_TAGS:
+                result.append('</p>')
+                p_opened = False
             
             # Append the current tag.
             result.append(full_tag)
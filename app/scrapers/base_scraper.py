@@ -1,12 +1,14 @@
 import logging
+import threading
 import time
 import re
+from collections import OrderedDict
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime, timedelta
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from app.core.config import settings
 from app.models.article import ArticleLinkModel, ArticleContentModel, ArticleFullModel
@@ -14,6 +16,9 @@ from app.services.api_client import APIClient
 
 logger = logging.getLogger(__name__)
 
+# charset declared in a <meta> tag of the raw page bytes
+_META_CHARSET_RE = re.compile(b'<meta[^>]*charset=[\'"]*([^\'">]*)')
+
 class BaseScraper(ABC):
     """
     Abstract base class for all scrapers.
@@ -21,19 +26,43 @@ class BaseScraper(ABC):
     All site-specific scrapers should inherit from this class and implement
     the abstract methods to handle site-specific scraping logic.
     """
+
+    # BeautifulSoup tree builder used for fetched pages; subclasses may switch to 'lxml'
+    PARSER = 'html.parser'
+
+    # Tree builder for article pages and bodies. html.parser keeps a <div> nested in a <p>
+    # inside the paragraph, where lxml closes the <p> and its remaining text is lost
+    ARTICLE_PARSER = 'html.parser'
+
+    # (connect, read) timeouts in seconds for page fetches, so a stalled site cannot hang a run
+    TIMEOUT = (5, 30)
+
+    # Number of source -> uploaded image URLs remembered by upload_image
+    UPLOAD_CACHE_SIZE = 2048
     
-    def __init__(self, source_name: str, max_age_days: int = 8):
+    def __init__(self, source_name: str, max_age_days: int = 8, api_client: Optional[APIClient] = None):
         """
         Initialize the base scraper.
         
         Args:
             source_name: Name of the news source
             max_age_days: Maximum age of articles to scrape in days
+            api_client: Shared API client; a new one is created only when none is given
         """
         self.source_name = source_name
         self.max_age_days = max_age_days
         self.headers = {"User-Agent": settings.USER_AGENT}
-        self.api_client = APIClient()
+        # One session per scraper so the listing page and its articles, which live on
+        # the same host, reuse a keep-alive connection instead of a new TCP/TLS handshake
+        # per page. requests negotiates gzip/deflate and decodes it transparently.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.api_client = api_client or APIClient()
+        # ScraperController that tracks this scraper's progress and logs; set by the
+        # controller that owns the scraper, None when the scraper runs on its own
+        self.controller = None
+        self._upload_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._upload_cache_lock = threading.Lock()
         logger.info(f"Initialized {source_name} scraper")
         
     def get_html(self, url: str) -> Optional[str]:
@@ -47,7 +76,7 @@ class BaseScraper(ABC):
             HTML content as string, or None if request failed
         """
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, timeout=self.TIMEOUT)
             response.raise_for_status()
             
             # First try to detect encoding from the HTTP response or HTML meta tags
@@ -61,8 +90,7 @@ class BaseScraper(ABC):
             # Look for meta charset in the HTML
             content_bytes = response.content
             try:
-                import re
-                charset_match = re.search(b'<meta[^>]*charset=[\'"]*([^\'">]*)', content_bytes)
+                charset_match = _META_CHARSET_RE.search(content_bytes)
                 if charset_match:
                     detected_charset = charset_match.group(1).decode('ascii')
                     logger.debug(f"Found charset in HTML meta tag: {detected_charset}")
@@ -89,20 +117,93 @@ class BaseScraper(ABC):
             logger.error(f"Error fetching URL {url}: {str(e)}")
             return None
             
-    def get_soup(self, url: str) -> Optional[BeautifulSoup]:
+    def get_soup(
+        self,
+        url: str,
+        parse_only: Optional[SoupStrainer] = None,
+        parser: Optional[str] = None
+    ) -> Optional[BeautifulSoup]:
         """
         Fetch and parse HTML content from a URL.
         
         Args:
             url: URL to fetch HTML from
+            parse_only: Optional strainer restricting the tree to the matching elements,
+                which skips building the rest of the page
+            parser: Tree builder to use instead of PARSER
             
         Returns:
             BeautifulSoup object, or None if request failed
         """
         html = self.get_html(url)
         if html:
-            return BeautifulSoup(html, 'html.parser', from_encoding='utf-8')
+            return BeautifulSoup(html, parser or self.PARSER, from_encoding='utf-8', parse_only=parse_only)
         return None
+
+    def upload_image(self, image_url: str) -> str:
+        """
+        Upload an image through the API client, reusing earlier uploads of the same URL.
+        
+        Shared images (logos, series banners) are uploaded once per scraper instance, and
+        passing an already-uploaded URL back in returns it unchanged. Failed uploads, which
+        return the original URL, are not cached so they are retried next time.
+        
+        Args:
+            image_url: The URL of the image to upload
+            
+        Returns:
+            The uploaded image URL, or the original URL if the upload failed
+        """
+        with self._upload_cache_lock:
+            cached = self._upload_cache.get(image_url)
+            if cached is not None:
+                self._upload_cache.move_to_end(image_url)
+                return cached
+
+        new_url = self.api_client.upload_image(image_url)
+        self._remember_upload(image_url, new_url)
+        return new_url
+
+    def upload_images(self, image_urls: List[str]) -> List[str]:
+        """
+        Upload several images at once, reusing earlier uploads like upload_image.
+        
+        Cached and repeated URLs are resolved locally; the rest are uploaded concurrently
+        by the API client.
+        
+        Args:
+            image_urls: URLs of the images to upload
+            
+        Returns:
+            The uploaded image URLs in the same order, with the original URL for failed uploads
+        """
+        results: List[Optional[str]] = [None] * len(image_urls)
+        pending: Dict[str, List[int]] = {}
+        with self._upload_cache_lock:
+            for index, image_url in enumerate(image_urls):
+                cached = self._upload_cache.get(image_url)
+                if cached is not None:
+                    self._upload_cache.move_to_end(image_url)
+                    results[index] = cached
+                else:
+                    pending.setdefault(image_url, []).append(index)
+
+        if pending:
+            uploaded = self.api_client.upload_images(list(pending))
+            for (image_url, indexes), new_url in zip(pending.items(), uploaded):
+                self._remember_upload(image_url, new_url)
+                for index in indexes:
+                    results[index] = new_url
+        return results
+
+    def _remember_upload(self, image_url: str, new_url: Optional[str]) -> None:
+        """Cache a successful upload under both its source and its uploaded URL."""
+        if new_url and new_url != image_url:
+            with self._upload_cache_lock:
+                self._upload_cache[image_url] = new_url
+                self._upload_cache[new_url] = new_url
+                while len(self._upload_cache) > self.UPLOAD_CACHE_SIZE:
+                    self._upload_cache.popitem(last=False)
         
     @abstractmethod
     def get_article_links(self, url: str) -> List[ArticleLinkModel]:
@@ -154,7 +255,7 @@ class BaseScraper(ABC):
         Returns:
             List of processed articles
         """
-        from app.controllers.scraper_controller import scraper_controller
+        scraper_controller = self.controller
         start_time = datetime.now()
         
         logger.info(f"Starting scraper for {self.source_name} at {source_url}")
@@ -168,14 +269,14 @@ class BaseScraper(ABC):
         
         # Update progress - after finding links
         if hasattr(scraper_controller, "_scraping_progress") and self.source_name in scraper_controller._scraping_progress:
-            scraper_controller._scraping_progress[self.source_name].update({
+            scraper_controller.update_progress(self.source_name, {
                 "articles_found": len(article_links),
                 "progress": 10,  # 10% complete after finding links
                 "elapsed_time": str(datetime.now() - start_time).split('.')[0]  # Remove microseconds
             })
             log_message = f"Found {len(article_links)} articles to process for {self.source_name}"
             if hasattr(scraper_controller, "_scraping_logs"):
-                scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                scraper_controller.add_log(log_message)
         
         # Process articles
         processed_articles = []
@@ -201,7 +302,7 @@ class BaseScraper(ABC):
             # Update progress for article processing
             progress_percentage = 10 + int((i / len(article_links)) * 90) if len(article_links) > 0 else 100
             if hasattr(scraper_controller, "_scraping_progress") and self.source_name in scraper_controller._scraping_progress:
-                scraper_controller._scraping_progress[self.source_name].update({
+                scraper_controller.update_progress(self.source_name, {
                     "progress": progress_percentage,
                     "articles_processed": len(processed_articles),
                     "current_article": url,
@@ -217,7 +318,7 @@ class BaseScraper(ABC):
                     # Log skipped article
                     if hasattr(scraper_controller, "_scraping_logs"):
                         log_message = f"Skipping article {i+1}/{len(article_links)} (already exists in API): {url}"
-                        scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                        scraper_controller.add_log(log_message)
                     
                     # If we've found 10 articles already exist, we can stop processing
                     # This helps avoid processing a large number of duplicate articles
@@ -225,7 +326,7 @@ class BaseScraper(ABC):
                         logger.info(f"Found {articles_existing_in_api} articles that already exist in API. Stopping processing.")
                         if hasattr(scraper_controller, "_scraping_logs"):
                             log_message = f"Found {articles_existing_in_api} articles that already exist in API. Stopping processing to avoid duplicates."
-                            scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                            scraper_controller.add_log(log_message)
                         break
                     
                     continue
@@ -238,7 +339,7 @@ class BaseScraper(ABC):
             # Log current article processing
             if hasattr(scraper_controller, "_scraping_logs"):
                 log_message = f"Processing article {i+1}/{len(article_links)}: {url}"
-                scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                scraper_controller.add_log(log_message)
             
             # Get article content
             content = self.get_article_content(url, date)
@@ -248,7 +349,7 @@ class BaseScraper(ABC):
                 # Log failure
                 if hasattr(scraper_controller, "_scraping_logs"):
                     log_message = f"Failed to get content for article: {url}"
-                    scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                    scraper_controller.add_log(log_message)
                 
                 continue
                 
@@ -260,7 +361,7 @@ class BaseScraper(ABC):
                 # Log failure
                 if hasattr(scraper_controller, "_scraping_logs"):
                     log_message = f"Failed to process content for article: {url}"
-                    scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                    scraper_controller.add_log(log_message)
                 
                 continue
                 
@@ -283,31 +384,24 @@ class BaseScraper(ABC):
                     processed_dict['imagesUrl'] = []
                 
                 # --- Image Upload --- 
-                # Upload thumbnail if it exists
-                if processed.thumbnailImage:
-                    try:
-                        new_thumbnail_url = self.api_client.upload_image(processed.thumbnailImage)
-                        processed_dict['thumbnailImage'] = new_thumbnail_url
-                        logger.info(f"Uploaded thumbnail for {url}: {new_thumbnail_url}")
-                    except Exception as upload_err:
-                        logger.error(f"Failed to upload thumbnail {processed.thumbnailImage} for {url}: {upload_err}")
-                        processed_dict['thumbnailImage'] = None # Keep original or set to None? Decide based on requirement
-                else:
-                    processed_dict['thumbnailImage'] = None
+                # process_article_content normally uploads these already, in which case the
+                # upload cache answers without a request; anything left is uploaded in parallel
+                images = processed_dict.get('imagesUrl') or []
+                image_urls = [image['url'] for image in images if image.get('url')]
+                thumbnail_urls = [processed.thumbnailImage] if processed.thumbnailImage else []
+                try:
+                    uploaded_urls = self.upload_images(thumbnail_urls + image_urls)
+                    logger.info(f"Uploaded {len(uploaded_urls)} images for {url}")
+                except Exception as upload_err:
+                    logger.error(f"Failed to upload images for {url}: {upload_err}")
+                    uploaded_urls = [None] * len(thumbnail_urls) + image_urls
 
-                # Upload images in imagesUrl
-                new_image_urls = []
-                if processed_dict.get('imagesUrl') and isinstance(processed_dict.get('imagesUrl'), list):
-                    for image_url in processed_dict['imagesUrl']:
-                        try:
-                            new_image_url = self.api_client.upload_image(image_url)
-                            new_image_urls.append(new_image_url)
-                            logger.info(f"Uploaded image for {url}: {new_image_url}")
-                        except Exception as upload_err:
-                            logger.error(f"Failed to upload image {image_url} for {url}: {upload_err}")
-                            # Optionally keep original URL if upload fails
-                            # new_image_urls.append(image_url) 
-                processed_dict['imagesUrl'] = new_image_urls
+                uploaded_urls = iter(uploaded_urls)
+                processed_dict['thumbnailImage'] = next(uploaded_urls) if thumbnail_urls else None
+                for image in images:
+                    if image.get('url'):
+                        image['url'] = next(uploaded_urls)
+                processed_dict['imagesUrl'] = images
                 # --- End Image Upload --- 
                   
                 # Add to processed articles
@@ -316,7 +410,7 @@ class BaseScraper(ABC):
                 # Log success
                 if hasattr(scraper_controller, "_scraping_logs"):
                     log_message = f"Successfully processed article: {url}"
-                    scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                    scraper_controller.add_log(log_message)
                 
             except Exception as e:
                 logger.error(f"Error processing article {url}: {e}")
@@ -324,7 +418,7 @@ class BaseScraper(ABC):
                 # Log failure
                 if hasattr(scraper_controller, "_scraping_logs"):
                     log_message = f"Error processing article {url}: {e}"
-                    scraper_controller._scraping_logs.append(f"[{datetime.now().isoformat()}] {log_message}")
+                    scraper_controller.add_log(log_message)
                 
                 continue
                 
@@ -334,7 +428,7 @@ class BaseScraper(ABC):
                 
         # Update progress - completed
         if hasattr(scraper_controller, "_scraping_progress") and self.source_name in scraper_controller._scraping_progress:
-            scraper_controller._scraping_progress[self.source_name].update({
+            scraper_controller.update_progress(self.source_name, {
                 "progress": 100,
                 "status": "completed",
                 "articles_processed": len(processed_articles),
@@ -3,22 +3,50 @@ import re
 from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime, timedelta, timezone
 
-from bs4 import BeautifulSoup
-from persiantools.jdatetime import JalaliDateTime
+from bs4 import BeautifulSoup, Tag
+from lxml import etree, html as lxml_html
 
 from app.core.config import settings
 from app.models.article import ArticleLinkModel, ArticleContentModel, ArticleFullModel, ImageModel
 from app.scrapers.base_scraper import BaseScraper
 from app.services.api_client import APIClient
+from app.utils.jalali import jalali_to_gregorian
 
 logger = logging.getLogger(__name__)
 
+# Tags that fix_html_paragraphs cares about; group 2 marks closing tags, group 3 is the tag name
+_FIX_TAG_RE = re.compile(
+    r'(<\s*(/)?\s*(p|a|strong|h[1-6]|figure|blockquote)\b[^>]*>)',
+    re.IGNORECASE
+)
+
+# Opening tags that implicitly end an open <p>
+_P_TRIGGER_TAGS = frozenset({'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'figure', 'blockquote'})
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements that carry the given class token."""
+    return f'[contains(concat(" ", normalize-space(@class), " "), " {name} ")]'
+
+# Links in the first categories widget, compiled once
+_TAGS_XPATH = etree.XPath(
+    '(//div' + _has_class('elementor-element') + _has_class('elementor-widget-HarikaSACategories') +
+    '/div' + _has_class('elementor-widget-container') +
+    '/div' + _has_class('harika-categories-widget') + ')[1]//a'
+)
+
+# Frozen copy of the Persian month map, read once per listing entry
+_PERSIAN_MONTHS = dict(settings.PERSIAN_MONTHS)
+
 class DefierScraper(BaseScraper):
     """
     Scraper for Defier news website.
     """
+
+    # lxml's C tree builder parses the listing pages several times faster than html.parser;
+    # article pages and bodies keep ARTICLE_PARSER so a <div> inside a <p> is not split off
+    PARSER = 'lxml'
     
-    def __init__(self, api_client=None, max_age_days: int = 3):
+    def __init__(self, api_client: Optional[APIClient] = None, max_age_days: int = 3):
         """
         Initialize the Defier scraper.
         
@@ -26,8 +54,7 @@ class DefierScraper(BaseScraper):
             api_client: An instance of the APIClient for uploading images.
             max_age_days: Maximum age of articles to scrape in days
         """
-        super().__init__("Defier", max_age_days)
-        self.api_client = api_client
+        super().__init__("Defier", max_age_days, api_client)
         
     def get_article_links(self, url: str) -> List[ArticleLinkModel]:
         """
@@ -71,13 +98,12 @@ class DefierScraper(BaseScraper):
                         month_name = date_parts[1]
                         year = int(date_parts[2])
 
-                        month = settings.PERSIAN_MONTHS.get(month_name)
+                        month = _PERSIAN_MONTHS.get(month_name)
                         if not month:
                             logger.error(f"Unknown Persian month: {month_name}")
                             continue
 
-                        jalali_date = JalaliDateTime(year, month, day)
-                        gregorian_date = jalali_date.to_gregorian()
+                        gregorian_date = jalali_to_gregorian(year, month, day)
 
                         article_datetime = datetime(
                             gregorian_date.year,
@@ -111,7 +137,7 @@ class DefierScraper(BaseScraper):
         """
         Get article content from a Defier article page.
         """
-        soup = self.get_soup(url)
+        soup = self.get_soup(url, parser=self.ARTICLE_PARSER)
         
     
         if not soup:
@@ -136,7 +162,7 @@ class DefierScraper(BaseScraper):
             title_text = title.get_text(strip=True) if title else "N/A"
             
 
-            thumbnail_image = self.extract_thumbnail_image(data_html)
+            thumbnail_image = self.extract_thumbnail_image(data)
             logger.info(f"Extracted thumbnail in get_article_content: {thumbnail_image}")
 
             return ArticleContentModel(
@@ -168,27 +194,24 @@ class DefierScraper(BaseScraper):
                 logger.error(f"No HTML content found for article: {article.link}")
                 return None
             
-            # Upload thumbnail image
-            uploaded_thumbnail_url = None
-            if article.thumbnail_image:
-                logger.info(f"Uploading thumbnail: {article.thumbnail_image}")
-                uploaded_thumbnail_url = self.api_client.upload_image(article.thumbnail_image)
-                logger.info(f"Thumbnail uploaded to: {uploaded_thumbnail_url}")
-            else:
+            if not article.thumbnail_image:
                 logger.warning(f"No thumbnail found to upload for {article.link}")
             
             # Extract and process images
             html_with_placeholders, images = self.extract_and_replace_images(html_content)
             
-            # Upload additional images and update their URLs
+            # Upload the thumbnail and the article images together, in parallel
+            image_urls = [img_data['url'] for img_data in images if img_data.get('url')]
+            thumbnail_urls = [article.thumbnail_image] if article.thumbnail_image else []
+            logger.info(f"Uploading {len(thumbnail_urls) + len(image_urls)} images for {article.link}")
+            uploaded_urls = iter(self.upload_images(thumbnail_urls + image_urls))
+            uploaded_thumbnail_url = next(uploaded_urls) if thumbnail_urls else None
+            
+            # Update the image URLs with the uploaded ones
             uploaded_images = []
             for img_data in images:
-                original_url = img_data.get('url')
-                if original_url:
-                    logger.info(f"Uploading image: {original_url}")
-                    new_url = self.api_client.upload_image(original_url)
-                    logger.info(f"Image uploaded to: {new_url}")
-                    img_data['url'] = new_url  # Update the URL in the dictionary
+                if img_data.get('url'):
+                    img_data['url'] = next(uploaded_urls)  # Update the URL in the dictionary
                 else:
                     logger.warning(f"Image data missing URL: {img_data}")
                 uploaded_images.append(img_data)
@@ -232,13 +255,10 @@ class DefierScraper(BaseScraper):
             logger.error(f"Error processing article content for {article.link}: {e}")
             return None
             
-    def extract_thumbnail_image(self, html: str) -> Optional[str]:
+    def extract_thumbnail_image(self, soup: Tag) -> Optional[str]:
         """
-        Extract the thumbnail image from the article HTML.
+        Extract the thumbnail image from the already-parsed article element.
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        
         try:
 
             featured_img = soup.select_one('div.elementor-element > div.elementor-widget-container > div.harika-featuredimage-widget')
@@ -268,7 +288,7 @@ class DefierScraper(BaseScraper):
         Cleans extra whitespace and ignores empty paragraphs.
         """
         html = self.fix_html_paragraphs(html)
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, self.ARTICLE_PARSER)
         content_elements = {}
 
         content_container = soup.select_one('div.elementor-element.elementor-element-f41c1d8.no-bg.elementor-widget.elementor-widget-theme-post-content')
@@ -286,8 +306,7 @@ class DefierScraper(BaseScraper):
             if element.name == 'p' and element.parent.name == 'blockquote':
                 continue
                 
-            text = element.get_text(separator=" ", strip=True)
-            text = re.sub(r'\s+', ' ', text).strip()
+            text = ' '.join(element.get_text(separator=" ").split())
             
             if not text:
                 continue
@@ -311,21 +330,19 @@ class DefierScraper(BaseScraper):
         Returns:
             List of tags
         """
-        soup = BeautifulSoup(html, 'html.parser')
         tags = []
+        seen = set()
         
         try:
-            tag_container = soup.select_one('div.elementor-element.elementor-widget-HarikaSACategories > div.elementor-widget-container > div.harika-categories-widget')
-            if tag_container:
-                tag_links = tag_container.select('a')
-                for tag_link in tag_links:
-                    tag_text = tag_link.get_text(strip=True)
-                    if tag_text and tag_text not in tags:
-                        tags.append(tag_text)
-                        
-            # Limit to a maximum of 10 tags
-            if len(tags) > 10:
-                tags = tags[:10]
+            # Only the categories widget is needed, so query lxml directly instead of building a soup
+            for tag_link in _TAGS_XPATH(lxml_html.fromstring(html)):
+                tag_text = tag_link.text_content().strip()
+                if tag_text and tag_text not in seen:
+                    seen.add(tag_text)
+                    tags.append(tag_text)
+                    # Limit to a maximum of 10 tags
+                    if len(tags) == 10:
+                        break
                 
             return tags
             
@@ -334,35 +351,6 @@ class DefierScraper(BaseScraper):
             return []
     
 
-    def is_in_excluded_container(self, html: str, position: int) -> bool:
-        """
-        Check if the given position in HTML is within an excluded container.
-        This is a placeholder function - implement according to your exclusion criteria.
-        
-        Args:
-            html: The HTML content
-            position: The position to check
-            
-        Returns:
-            True if position is in an excluded container, False otherwise
-        """
-        excluded_containers = [
-        "jeg_share_bottom_container",
-        "jeg_ad_jeg_article_jnews_content_bottom_ads",
-        "jnews_prev_next_container",
-        "jnews_author_box_container",
-        "jnews_related_post_container",
-        "jeg_postblock_22 jeg_postblock jeg_module_hook jeg_pagination_disable jeg_col_2o3 jnews_module_307974_0_67c3fad848cb2",
-        "jnews_popup_post_container",
-        "jnews_comment_container",
-        ]
-        snippet = html[position:position+100]
-        
-        for container in excluded_containers:
-            pattern = r'<div[^>]*class="[^"]*' + re.escape(container) + r'[^"]*"[^>]*>[\s\S]*?' + re.escape(snippet)
-            if re.search(pattern, html, re.IGNORECASE):
-                return True
-        return False
     def fix_html_paragraphs(self,html_content: str) -> str:
         """
         Processes the HTML content to ensure that if a <p> tag is open and one of the following
@@ -376,56 +364,52 @@ class DefierScraper(BaseScraper):
         If a <p> tag is already closed, nothing is added.
         
         Also removes p tags inside blockquotes while preserving their content.
-        Additionally removes a tags inside blockquotes while preserving their content and adding a space after.
+        Additionally removes a and strong tags inside blockquotes while preserving their
+        content and adding a space after.
+
+        Everything is done in a single pass over the tag stream, without building a DOM.
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        for blockquote in soup.find_all('blockquote'):
-            for a_tag in blockquote.find_all('a', recursive=True):
-                a_text = a_tag.get_text()
-                a_tag.replace_with(f"{a_text} ")
-            for strong_tag in blockquote.find_all('strong', recursive=True):
-                strong_text = strong_tag.get_text()
-                strong_tag.replace_with(f"{strong_text} ")
-            
-            for p_tag in blockquote.find_all('p', recursive=True):
-                p_tag.replace_with(*p_tag.contents)
-        
-        html_content = str(soup)
-        
-        pattern = re.compile(
-            r'(<\s*(/)?\s*(p|h[1-6]|figure|blockquote)\b[^>]*>)', 
-            re.IGNORECASE
-        )
-        
         result = []
         last_index = 0
         p_opened = False
+        blockquote_depth = 0
 
-        for match in pattern.finditer(html_content):
-            full_tag = match.group(1)   
-            is_closing = bool(match.group(2)) 
-            tag_type = match.group(3).lower() 
+        for match in _FIX_TAG_RE.finditer(html_content):
+            full_tag = match.group(1)
+            is_closing = bool(match.group(2))
+            tag_type = match.group(3).lower()
             start, end = match.span(1)
-            
+
 
             result.append(html_content[last_index:start])
-            
+            last_index = end
+
+            # Unwrap inline tags and paragraphs inside blockquotes
+            if blockquote_depth and tag_type in ('a', 'strong', 'p'):
+                if is_closing and tag_type != 'p':
+                    result.append(' ')
+                continue
+
+            if tag_type in ('a', 'strong'):
+                result.append(full_tag)
+                continue
+
+            if p_opened and not is_closing and tag_type in _P_TRIGGER_TAGS:
+                result.append('</p>')
+                p_opened = False
 
-            if not is_closing and tag_type in ('p', 'figure', 'blockquote') or (not is_closing and tag_type.startswith('h')):
-                if p_opened:
-                    result.append('</p>')
-                    p_opened = False
-            
             result.append(full_tag)
-            
+
             if tag_type == 'p':
                 if is_closing:
                     p_opened = False
                 else:
                     p_opened = True
-
-            last_index = end
+            elif tag_type == 'blockquote':
+                if is_closing:
+                    blockquote_depth = max(blockquote_depth - 1, 0)
+                else:
+                    blockquote_depth += 1
 
         result.append(html_content[last_index:])
         
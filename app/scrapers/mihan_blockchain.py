@@ -1,23 +1,100 @@
 import logging
 import re
+from functools import lru_cache
 from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime, timedelta, timezone
 
-from bs4 import BeautifulSoup,NavigableString
-from persiantools.jdatetime import JalaliDateTime
+import soupsieve as sv
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
 
 from app.core.config import settings
 from app.models.article import ArticleLinkModel, ArticleContentModel, ArticleFullModel, ImageModel
 from app.scrapers.base_scraper import BaseScraper
 from app.services.api_client import APIClient
+from app.utils.jalali import jalali_to_gregorian
 
 logger = logging.getLogger(__name__)
 
+# Tags that fix_html_paragraphs cares about; group 2 marks closing tags, group 3 is the tag name
+_FIX_TAG_RE = re.compile(
+    r'(<\s*(/)?\s*(p|a|strong|h[1-6]|figure|blockquote)\b[^>]*>)',
+    re.IGNORECASE
+)
+
+# Opening tags that implicitly end an open <p>
+_P_TRIGGER_TAGS = frozenset({'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'figure', 'blockquote'})
+
+# Frozen copy of the Persian month map, read once per listing entry
+_PERSIAN_MONTHS = dict(settings.PERSIAN_MONTHS)
+
+# Image placeholder marker inside a placeholder figure
+_PLACEHOLDER_MARK_RE = re.compile(r'\*\*IMAGE_PLACEHOLDER_img\d+\*\*')
+
+# Image placeholder markers left in paragraph text, with their surrounding whitespace
+_PLACEHOLDER_RE = re.compile(r'\s*\*\*IMAGE_PLACEHOLDER_img\d+\*\*\s*')
+
+# CSS selectors compiled once; the listing and figure ones run inside per-item loops
+_SEL_LISTING_ARTICLES = sv.compile('div.jnews_category_content_wrapper > div.jeg_postblock_4.jeg_postblock > div.jeg_posts.jeg_block_container > div.jeg_posts > article.jeg_post')
+_SEL_LISTING_LINK = sv.compile('h3.jeg_post_title > a')
+_SEL_LISTING_DATE = sv.compile('div.jeg_meta_date > a')
+_SEL_INNER_CONTENT = sv.compile('div.jeg_inner_content')
+_SEL_CREATOR = sv.compile('div.jeg_meta_container > div.jeg_post_meta.jeg_post_meta_1 > div.meta_left > div.jeg_meta_author > a')
+_SEL_TITLE = sv.compile('div.entry-header > h1.jeg_post_title')
+_SEL_ENTRY_CONTENT = sv.compile('div.entry-content')
+_SEL_THUMBNAIL = sv.compile('div.jeg_featured > a > div.thumbnail-container')
+_SEL_FIGURE_BLOCK = sv.compile('div.wp-block-image')
+_SEL_FIGURE_IMG = sv.compile('figure a img[data-lazy-src]')
+_SEL_MAIN_ARTICLE = sv.compile('article.main-article')
+_SEL_ARTICLE_CONTENT = sv.compile('div.article-content')
+_SEL_TOC = sv.compile("#ez-toc-container, p.ez-toc-title, nav > ul.ez-toc-list")
+_SEL_TAGS = sv.compile('div.jeg_post_tags')
+_SEL_UNWANTED = sv.compile(
+    "div.jeg_post_source, div.jeg_post_tags, script, style, noscript, header, footer, aside"
+)
+
+# Article page parts read by get_article_content: body, title header and author meta
+_ARTICLE_STRAINER = SoupStrainer(
+    'div',
+    attrs={'class': re.compile(r'\b(jeg_inner_content|entry-content|jeg_meta_container|entry-header)\b')}
+)
+
+@lru_cache(maxsize=512)
+def _jalali_to_utc(year: int, month: int, day: int) -> datetime:
+    """
+    Convert a Jalali date to midnight UTC of the matching Gregorian day.
+    Cached because listing pages repeat the same few publish dates.
+    """
+    gregorian_date = jalali_to_gregorian(year, month, day)
+    return datetime(
+        gregorian_date.year,
+        gregorian_date.month,
+        gregorian_date.day,
+        tzinfo=timezone.utc
+    )
+
 class MihanBlockchainScraper(BaseScraper):
     """
     Scraper for MihanBlockchain news website.
     """
     
+    # libxml2's C parser for the listing pages; article pages and bodies keep ARTICLE_PARSER
+    PARSER = 'lxml'
+
+    # Out-of-date listing entries tolerated in a row before get_article_links stops
+    STALE_TOLERANCE = 2
+
+    # Page widgets whose images are not part of the article body
+    EXCLUDED_CONTAINERS = frozenset({
+        "jeg_share_bottom_container",
+        "jeg_ad_jeg_article_jnews_content_bottom_ads",
+        "jnews_prev_next_container",
+        "jnews_author_box_container",
+        "jnews_related_post_container",
+        "jnews_module_307974_0_67c3fad848cb2",
+        "jnews_popup_post_container",
+        "jnews_comment_container",
+    })
+
     def __init__(self, api_client: APIClient, max_age_days: int = 3):
         """
         Initialize the MihanBlockchain scraper.
@@ -26,8 +103,7 @@ class MihanBlockchainScraper(BaseScraper):
             api_client: An instance of the APIClient for uploading images.
             max_age_days: Maximum age of articles to scrape in days
         """
-        super().__init__("MihanBlockchain", max_age_days)
-        self.api_client = api_client
+        super().__init__("MihanBlockchain", max_age_days, api_client)
         
     def get_article_links(self, url: str) -> List[ArticleLinkModel]:
         """
@@ -42,23 +118,33 @@ class MihanBlockchainScraper(BaseScraper):
             
 
         current_time = datetime.now(timezone.utc)
+        cutoff = current_time - timedelta(days=self.max_age_days)
+
+        # Bind lookups used on every iteration to locals
+        persian_months = _PERSIAN_MONTHS
+        jalali_to_utc = _jalali_to_utc
+        append_result = result.append
+
+        # The category page lists newest first; a few stale entries in a row (pinned or
+        # slightly out-of-order posts aside) mean the rest of the page is older still
+        stale_in_a_row = 0
         
 
-        articles = soup.select('div.jnews_category_content_wrapper > div.jeg_postblock_4.jeg_postblock > div.jeg_posts.jeg_block_container > div.jeg_posts > article.jeg_post')
+        articles = _SEL_LISTING_ARTICLES.select(soup)
         
         logger.info(f"Found {len(articles)} total articles on the page, will collect all within the past {self.max_age_days} days")
         
         for article in articles:
             try:
 
-                link_element = article.select_one('h3.jeg_post_title > a')
+                link_element = _SEL_LISTING_LINK.select_one(article)
                 if not link_element or not link_element.has_attr('href'):
                     continue
                     
                 link = link_element['href'].strip()
                 
 
-                date_element = article.select_one('div.jeg_meta_date > a')
+                date_element = _SEL_LISTING_DATE.select_one(article)
                 if not date_element:
                     continue
                     
@@ -73,29 +159,26 @@ class MihanBlockchainScraper(BaseScraper):
                         year = int(date_parts[2])
                         
                         # Convert Persian month name to number
-                        month = settings.PERSIAN_MONTHS.get(month_name)
+                        month = persian_months.get(month_name)
                         if not month:
                             logger.error(f"Unknown Persian month: {month_name}")
                             continue
                             
 
-                        jalali_date = JalaliDateTime(year, month, day)
-                        gregorian_date = jalali_date.to_gregorian()
-                        
-                        article_datetime = datetime(
-                            gregorian_date.year,
-                            gregorian_date.month,
-                            gregorian_date.day,
-                            tzinfo=timezone.utc
-                        )
-
-                        time_diff = current_time - article_datetime
-                        if time_diff <= timedelta(days=self.max_age_days):
+                        article_datetime = jalali_to_utc(year, month, day)
+
+                        if article_datetime >= cutoff:
+                            stale_in_a_row = 0
                             formatted_date = article_datetime.strftime('%Y-%m-%d')
-                            result.append(ArticleLinkModel(
+                            append_result(ArticleLinkModel.model_construct(
                                 link=link,
                                 date=formatted_date
                             ))
+                        else:
+                            stale_in_a_row += 1
+                            if stale_in_a_row > self.STALE_TOLERANCE:
+                                logger.info(f"Stopping at {link}: older than {self.max_age_days} days")
+                                break
                             
                 except Exception as e:
                     logger.error(f"Error converting date {date_str}: {e}")
@@ -113,8 +196,9 @@ class MihanBlockchainScraper(BaseScraper):
     def get_article_content(self, url: str, date: str) -> Optional[ArticleContentModel]:
         """
         Get article content from a MihanBlockchain article page.
+        Only the article subtrees are parsed; sidebars, related posts and comments are skipped.
         """
-        soup = self.get_soup(url)
+        soup = self.get_soup(url, parse_only=_ARTICLE_STRAINER, parser=self.ARTICLE_PARSER)
         
     
         if not soup:
@@ -123,33 +207,34 @@ class MihanBlockchainScraper(BaseScraper):
         
         try:
 
-            data = soup.select_one('div.jeg_inner_content')
+            data = _SEL_INNER_CONTENT.select_one(soup)
             if not data:
                 logger.error(f"Could not find content div for article: {url}")
                 return None
-            
-            data_html = data.decode_contents()
 
 
-            creator = soup.select_one('div.jeg_meta_container > div.jeg_post_meta.jeg_post_meta_1 > div.meta_left > div.jeg_meta_author > a')
+            creator = _SEL_CREATOR.select_one(soup)
             creator_name = creator.get_text(strip=True) if creator else "N/A"
 
 
-            title = soup.select_one('div.entry-header > h1.jeg_post_title')
+            title = _SEL_TITLE.select_one(soup)
             title_text = title.get_text(strip=True) if title else "N/A"
             
 
-            thumbnail_image = self.extract_thumbnail_image(data_html)
+            thumbnail_image = self.extract_thumbnail_image(data)
             logger.info(f"Extracted thumbnail in get_article_content: {thumbnail_image}")
-            data_html = soup.select_one('div.entry-content').decode_contents()
+            body = _SEL_ENTRY_CONTENT.select_one(soup)
+            data_html = body.decode_contents()
 
-            return ArticleContentModel(
+            # Fields come straight from our own extraction, so skip pydantic validation
+            return ArticleContentModel.model_construct(
                 link=url,
                 date=date,
                 data=data_html,
                 creator=creator_name,
                 title=title_text,
-                thumbnail_image=thumbnail_image # Pass thumbnail here
+                thumbnail_image=thumbnail_image, # Pass thumbnail here
+                body=body
             )
         
         except Exception as e:
@@ -167,84 +252,122 @@ class MihanBlockchainScraper(BaseScraper):
             ArticleFullModel object, or None if processing failed
         """
         try:
-            html_content = article.data
-            if not html_content or html_content == "N/A":
-                logger.error(f"No HTML content found for article: {article.link}")
+            prepared = self.prepare_article_images(article)
+            if prepared is None:
                 return None
+            html_with_placeholders, images = prepared
             
-            # Upload thumbnail image
-            uploaded_thumbnail_url = None
-            if article.thumbnail_image:
-                logger.info(f"Uploading thumbnail: {article.thumbnail_image}")
-                uploaded_thumbnail_url = self.api_client.upload_image(article.thumbnail_image)
-                logger.info(f"Thumbnail uploaded to: {uploaded_thumbnail_url}")
-            else:
+            if not article.thumbnail_image:
                 logger.warning(f"No thumbnail found to upload for {article.link}")
             
-
-            html_with_placeholders, images = self.extract_and_replace_images(html_content)
+            # Upload the thumbnail and every figure together, on the API client's shared upload pool
+            image_urls = [img_data['url'] for img_data in images if img_data.get('url')]
+            thumbnail_urls = [article.thumbnail_image] if article.thumbnail_image else []
+            logger.info(f"Uploading {len(thumbnail_urls) + len(image_urls)} images for {article.link}")
+            uploaded_urls = iter(self.upload_images(thumbnail_urls + image_urls))
+            uploaded_thumbnail_url = next(uploaded_urls) if thumbnail_urls else None
             
-
-            uploaded_images = []
             for img_data in images:
-                original_url = img_data.get('url')
-                if original_url:
-                    logger.info(f"Uploading image: {original_url}")
-                    new_url = self.api_client.upload_image(original_url)
-                    logger.info(f"Image uploaded to: {new_url}")
-                    img_data['url'] = new_url  # Update the URL in the dictionary
+                if img_data.get('url'):
+                    img_data['url'] = next(uploaded_urls)  # Update the URL in the dictionary
                 else:
                     logger.warning(f"Image data missing URL: {img_data}")
-                uploaded_images.append(img_data)
-            
 
-            content = self.extract_content(html_with_placeholders)
-            
-            title = article.title
-            
-           
-            tags = self.extract_tags(html_content)
-            
-            
-            image_models = [
-                ImageModel(
-                    id=img['id'],
-                    url=img['url'],  
-                    caption=img['caption'],
-                    type=img['type']
-                ) for img in uploaded_images
-            ]
-            
-           
-            article_data = ArticleFullModel(
-                title=title,
-                source="Mihan Blockchain",
-                sourceUrl=article.link,
-                publishDate=article.date,
-                creator=article.creator,
-                thumbnailImage=uploaded_thumbnail_url, 
-                content=content,
-                tags=tags,
-                imagesUrl=image_models, 
-                sourceDate=article.date
-            )
-            
-            return article_data
+            return self.build_article(article, html_with_placeholders, images, uploaded_thumbnail_url)
                 
         except Exception as e:
             logger.error(f"Error processing article content for {article.link}: {e}")
             return None
+
+    def prepare_article_images(self, article: ArticleContentModel) -> Optional[Tuple[str, List[Dict]]]:
+        """
+        Swap the article's figures for placeholders, leaving the image URLs to be uploaded.
+        
+        Args:
+            article: ArticleContentModel object containing the raw article content
             
-    def extract_thumbnail_image(self, html: str) -> Optional[str]:
+        Returns:
+            Tuple of (HTML with placeholders, image dictionaries), or None if the article has no HTML
         """
-        Extract the thumbnail image from the article HTML.
+        html_content = article.data
+        if not html_content or html_content == "N/A":
+            logger.error(f"No HTML content found for article: {article.link}")
+            return None
+
+        # Reuse the tree parsed with the page; figures are replaced in place, so it is consumed here
+        body, article.body = article.body, None
+        if body is None:
+            body = BeautifulSoup(html_content, self.ARTICLE_PARSER)
+        return self.extract_and_replace_images(body)
+
+    def parse_article_body(self, html_with_placeholders: str) -> Tuple[List[str], Dict[str, str]]:
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        Run the CPU-bound part of article processing on the placeholder HTML.
         
+        Args:
+            html_with_placeholders: Article HTML with figures replaced by placeholders
+            
+        Returns:
+            Tuple of (tags, content elements)
+        """
+        # Parse the article body once and share the tree between the extractors
+        soup = BeautifulSoup(self.fix_html_paragraphs(html_with_placeholders), self.ARTICLE_PARSER)
+
+        # Tags must be read before extract_content strips the tag container
+        tags = self.extract_tags(soup)
+
+        content = self.extract_content(soup)
+        return tags, content
+
+    def build_article(
+        self,
+        article: ArticleContentModel,
+        html_with_placeholders: str,
+        images: List[Dict],
+        uploaded_thumbnail_url: Optional[str]
+    ) -> ArticleFullModel:
+        """
+        Assemble the final article once its images have been uploaded.
         
+        Args:
+            article: ArticleContentModel object containing the raw article content
+            html_with_placeholders: Article HTML with figures replaced by placeholders
+            images: Image dictionaries whose URLs already point at the uploaded copies
+            uploaded_thumbnail_url: Uploaded thumbnail URL, if any
+            
+        Returns:
+            ArticleFullModel object
+        """
+        tags, content = self.parse_article_body(html_with_placeholders)
+        
+        image_models = [
+            ImageModel.model_construct(
+                id=img['id'],
+                url=img['url'],  
+                caption=img['caption'],
+                type=img['type']
+            ) for img in images
+        ]
+        
+        # Everything here was produced by the extractors above; model_construct skips re-validating it
+        return ArticleFullModel.model_construct(
+            title=article.title,
+            sourceUrl=article.link,
+            creator=article.creator,
+            thumbnailImage=uploaded_thumbnail_url, 
+            content=content,
+            tags=tags,
+            imagesUrl=image_models, 
+            sourceDate=article.date
+        )
+            
+    def extract_thumbnail_image(self, soup: Tag) -> Optional[str]:
+        """
+        Extract the thumbnail image from the already parsed article tree.
+        """
         try:
 
-            featured_img = soup.select_one('div.jeg_featured > a > div.thumbnail-container')
+            featured_img = _SEL_THUMBNAIL.select_one(soup)
             if featured_img:
                 img_tag = featured_img.select_one('img')
                 if img_tag and 'data-lazy-src' in img_tag.attrs:
@@ -256,50 +379,39 @@ class MihanBlockchainScraper(BaseScraper):
             
         return None
         
-    def extract_and_replace_images(self,html: str) -> tuple[str, list[dict]]:
+    def extract_and_replace_images(self, soup: Tag) -> Tuple[str, List[Dict]]:
         """
-        Extract images from the article HTML and replace them with placeholders.
+        Extract images from the parsed article body and replace them with placeholders.
         
         Args:
-            html: HTML content of the article
+            soup: Parsed article body element; figures are replaced in place
             
         Returns:
             Tuple containing the processed HTML with placeholders and list of image data.
         """
-        processed_html = html
         images_url = []
         processed_urls = set()
         
-        figure_regex = (
-            r'<div class="wp-block-image">.*?'              
-            r'<figure[^>]*>'                              
-            r'.*?'                                         
-            r'<a[^>]*>'                                 
-            r'.*?'                                        
-            r'<img[^>]*data-lazy-src="([^"]+)"[^>]*>'       
-            r'.*?</a>'                                    
-            r'.*?'                                         
-            r'(?:<figcaption[^>]*>(.*?)</figcaption>)?'     
-            r'.*?</figure>'                                 
-            r'.*?</div>'                                  
-            )          
         image_counter = 0
         
-        for match in re.finditer(figure_regex, html, re.IGNORECASE | re.DOTALL):
-            full_match = match.group(0)
-            match_position = match.start()
-            image_url = match.group(1)
-            
+        for block in _SEL_FIGURE_BLOCK.select(soup):
+            img = _SEL_FIGURE_IMG.select_one(block)
+            if img is None:
+                continue
+            image_url = img['data-lazy-src']
 
-            if self.is_in_excluded_container(html, match_position) or image_url in processed_urls:
+            if image_url in processed_urls or self.is_in_excluded_container(block):
                 continue
-            
 
-            caption_html = match.group(2)
-            caption = re.sub(r'<[^>]+>', '', caption_html).strip() if caption_html else None
+            figcaption = block.find('figcaption')
+            caption = figcaption.get_text().strip() if figcaption else None
             
             image_id = f"img{image_counter}"
-            placeholder = f"<figure>**IMAGE_PLACEHOLDER_{image_id}** </figure>"
+            # Reuse the block's own <figure> as the bare placeholder element
+            placeholder = img.find_parent('figure')
+            placeholder.attrs = {}
+            placeholder.string = f"**IMAGE_PLACEHOLDER_{image_id}** "
+            block.replace_with(placeholder)
             
             images_url.append({
                 'id': image_id,
@@ -307,68 +419,49 @@ class MihanBlockchainScraper(BaseScraper):
                 'caption': caption,
                 'type': 'figure'
             })
-            
 
-            processed_html = processed_html.replace(full_match, placeholder)
             processed_urls.add(image_url)
             image_counter += 1
         
-        return processed_html, images_url
+        return soup.decode_contents(), images_url
 
-    def extract_content(self,html: str) -> dict:
+    def extract_content(self, soup: BeautifulSoup) -> dict:
         """
-        Extract content elements from the article HTML and return a dict with dynamic keys.
+        Extract content elements from the parsed article tree and return a dict with dynamic keys.
         Headings stored as hN0, hN1... Paragraphs as p0, p1... Blockquotes as blockquote0...
         Text extraction uses spaces as separators.
         Handles blockquotes containing only a single <p> tag.
         Removes EZ Table of Contents elements before processing.
         Figures with image placeholders are extracted. Unwanted divs/tags removed.
+        The tree is expected to be built from fix_html_paragraphs output and is modified in place.
         """
-        html = self.fix_html_paragraphs(html)
-        soup = BeautifulSoup(html, 'html.parser')
         content_elements = {}
 
-        content_container = soup.select_one('article.main-article')
+        content_container = _SEL_MAIN_ARTICLE.select_one(soup)
         if not content_container:
-            content_container = soup.select_one('div.article-content')
+            content_container = _SEL_ARTICLE_CONTENT.select_one(soup)
         if not content_container:
             content_container = soup.body if soup.body else soup
 
         # --- Remove specific unwanted sections FIRST ---
+        # One combined selector walks the tree once instead of once per selector;
+        # articles without a TOC return an empty list and nothing is mutated.
+        for element in _SEL_TOC.select(content_container):
+            if element.decomposed:
+                continue
 
-        toc_container = content_container.select_one("#ez-toc-container")
-        if toc_container:
-            toc_container.decompose()
-
-        toc_title = content_container.select_one("p.ez-toc-title")
-        if toc_title:
-            toc_title.decompose()
-
-
-        toc_list = content_container.select_one("nav > ul.ez-toc-list")
-        if toc_list:
-            toc_nav = toc_list.find_parent('nav')
-            if toc_nav:
+            if element.name == 'ul':
+                # Drop the whole <nav> wrapper, but only when it lives inside the container
+                element = element.parent
+                if element is content_container or content_container not in element.parents:
+                    continue
 
-                if toc_nav in content_container.find_all(recursive=False) or toc_nav.find_parent(content_container.name, id=content_container.get('id'), class_=content_container.get('class')):
-                    toc_nav.decompose()
-            else:
-                
-                if toc_list.parent:
-                    toc_list.decompose()
+            element.decompose()
 
         # --- Remove other general unwanted tags ---
-        general_unwanted_selectors = [
-            "div.jeg_post_source", "div.jeg_post_tags",
-            "script", "style", "noscript",
-            "header", "footer", "aside" 
-        ]
-        for selector in general_unwanted_selectors:
-
-            for element in content_container.select(selector):
-
-                if element.parent:
-                    element.decompose()
+        for element in _SEL_UNWANTED.select(content_container):
+            if not element.decomposed:
+                element.decompose()
 
         # --- Initialize counters and start processing content ---
         counters = {
@@ -377,12 +470,10 @@ class MihanBlockchainScraper(BaseScraper):
         }
 
         relevant_tags = ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'figure', 'blockquote', 'li']
-        processed_element_ids = set()
-        
 
         for element in content_container.find_all(relevant_tags, recursive=True):
-            element_id = id(element)
-            if element_id in processed_element_ids:
+            # Everything inside a blockquote was decomposed together with it below
+            if element.decomposed:
                 continue
 
             tag_name = element.name
@@ -391,12 +482,7 @@ class MihanBlockchainScraper(BaseScraper):
 
 
             if tag_name == 'figure':
-                if any(parent.name == 'blockquote' for parent in element.parents):
-
-                    processed_element_ids.add(element_id)
-                    continue
-
-                img_placeholder = element.find(string=re.compile(r'\*\*IMAGE_PLACEHOLDER_img\d+\*\*'))
+                img_placeholder = element.find(string=_PLACEHOLDER_MARK_RE)
                 if img_placeholder:
                     placeholder_text = img_placeholder.strip()
                     figure_text_check = element.get_text(separator=" ", strip=True)
@@ -404,7 +490,6 @@ class MihanBlockchainScraper(BaseScraper):
                         key = f"img{counters['img']}"
                         content_elements[key] = placeholder_text
                         counters['img'] += 1
-                        processed_element_ids.add(element_id)
                         continue
 
             elif tag_name == 'blockquote':
@@ -415,26 +500,19 @@ class MihanBlockchainScraper(BaseScraper):
                 cleaned_html = inner_html.strip()
                 
                 if not cleaned_html:
-                    processed_element_ids.add(element_id)
                     counters['blockquote'] -= 1
                     continue
                 
                 content_elements[key] = cleaned_html
                 
-                for child in element.find_all(recursive=True):
-                    processed_element_ids.add(id(child))
-                    
-                processed_element_ids.add(element_id)
+                # The quote is stored as HTML; drop its subtree so its own p/figure/li are skipped
+                element.decompose()
                 continue  
 
             elif tag_name.startswith('h'):
                 key = f"{tag_name}{counters[tag_name]}"
                 counters[tag_name] += 1
             elif tag_name == 'p':
-                if any(parent.name == 'blockquote' for parent in element.parents):
-                    processed_element_ids.add(element_id)
-                    continue
-                    
                 key = f"p{counters['p']}"
                 counters['p'] += 1
             elif tag_name == 'li':
@@ -442,59 +520,56 @@ class MihanBlockchainScraper(BaseScraper):
                 counters['li'] += 1
 
             if key is None:
-                processed_element_ids.add(element_id)
                 continue
 
-            text = target_element_for_text.get_text(separator=" ", strip=True)
-            text = re.sub(r'\s+', ' ', text).strip()
+            # str.split() with no argument drops empty and whitespace-only pieces itself
+            text = ' '.join(target_element_for_text.get_text(separator=" ").split())
 
             if not text:
-                processed_element_ids.add(element_id)
                 if key.startswith('p'): counters['p'] -= 1
                 elif key.startswith('h'): counters[tag_name] -= 1
                 elif key.startswith('li'): counters['li'] -=1
                 continue
 
             text_before_placeholder_removal = text
-            text = re.sub(r'\s*\*\*IMAGE_PLACEHOLDER_img\d+\*\*\s*', ' ', text).strip()
+            if 'IMAGE_PLACEHOLDER' in text:
+                text = _PLACEHOLDER_RE.sub(' ', text).strip()
 
             if not text and text_before_placeholder_removal:
-                processed_element_ids.add(element_id)
                 if key.startswith('p'): counters['p'] -= 1
                 elif key.startswith('h'): counters[tag_name] -= 1
                 elif key.startswith('li'): counters['li'] -=1
                 continue
 
             content_elements[key] = text
-            processed_element_ids.add(element_id)
 
         return content_elements
             
-    def extract_tags(self, html: str) -> List[str]:
+    def extract_tags(self, soup: BeautifulSoup) -> List[str]:
         """
-        Extract tags from the article HTML.
+        Extract tags from the parsed article tree.
         
         Args:
-            html: HTML content of the article
+            soup: Parsed HTML content of the article
             
         Returns:
             List of tags
         """
-        soup = BeautifulSoup(html, 'html.parser')
         tags = []
+        seen = set()
         
         try:
-            tag_container = soup.select_one('div.jeg_post_tags')
+            tag_container = _SEL_TAGS.select_one(soup)
             if tag_container:
                 tag_links = tag_container.select('a')
                 for tag_link in tag_links:
                     tag_text = tag_link.get_text(strip=True)
-                    if tag_text and tag_text not in tags:
+                    if tag_text and tag_text not in seen:
+                        seen.add(tag_text)
                         tags.append(tag_text)
-                        
-            # Limit to a maximum of 10 tags
-            if len(tags) > 10:
-                tags = tags[:10]
+                        # Limit to a maximum of 10 tags
+                        if len(tags) == 10:
+                            break
                 
             return tags
             
@@ -503,35 +578,23 @@ class MihanBlockchainScraper(BaseScraper):
             return []
     
 
-    def is_in_excluded_container(self, html: str, position: int) -> bool:
+    def is_in_excluded_container(self, element: Tag) -> bool:
         """
-        Check if the given position in HTML is within an excluded container.
-        This is a placeholder function - implement according to your exclusion criteria.
+        Check if the element sits inside one of the excluded page widgets.
         
         Args:
-            html: The HTML content
-            position: The position to check
+            element: The element to check
             
         Returns:
-            True if position is in an excluded container, False otherwise
+            True if an ancestor carries an excluded class, False otherwise
         """
-        excluded_containers = [
-        "jeg_share_bottom_container",
-        "jeg_ad_jeg_article_jnews_content_bottom_ads",
-        "jnews_prev_next_container",
-        "jnews_author_box_container",
-        "jnews_related_post_container",
-        "jeg_postblock_22 jeg_postblock jeg_module_hook jeg_pagination_disable jeg_col_2o3 jnews_module_307974_0_67c3fad848cb2",
-        "jnews_popup_post_container",
-        "jnews_comment_container",
-        ]
-        snippet = html[position:position+100]
-        
-        for container in excluded_containers:
-            pattern = r'<div[^>]*class="[^"]*' + re.escape(container) + r'[^"]*"[^>]*>[\s\S]*?' + re.escape(snippet)
-            if re.search(pattern, html, re.IGNORECASE):
+        excluded = self.EXCLUDED_CONTAINERS
+        for parent in element.parents:
+            classes = parent.get('class')
+            if classes and not excluded.isdisjoint(classes):
                 return True
         return False
+
     def fix_html_paragraphs(self,html_content: str) -> str:
         """
         Processes the HTML content to ensure that if a <p> tag is open and one of the following
@@ -545,56 +608,52 @@ class MihanBlockchainScraper(BaseScraper):
         If a <p> tag is already closed, nothing is added.
         
         Also removes p tags inside blockquotes while preserving their content.
-        Additionally removes a tags inside blockquotes while preserving their content and adding a space after.
+        Additionally removes a and strong tags inside blockquotes while preserving their
+        content and adding a space after.
+
+        Everything is done in a single pass over the tag stream, without building a DOM.
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        for blockquote in soup.find_all('blockquote'):
-            for a_tag in blockquote.find_all('a', recursive=True):
-                a_text = a_tag.get_text()
-                a_tag.replace_with(f"{a_text} ")
-            for strong_tag in blockquote.find_all('strong', recursive=True):
-                strong_text = strong_tag.get_text()
-                strong_tag.replace_with(f"{strong_text} ")
-            
-            for p_tag in blockquote.find_all('p', recursive=True):
-                p_tag.replace_with(*p_tag.contents)
-        
-        html_content = str(soup)
-        
-        pattern = re.compile(
-            r'(<\s*(/)?\s*(p|h[1-6]|figure|blockquote)\b[^>]*>)', 
-            re.IGNORECASE
-        )
-        
         result = []
         last_index = 0
         p_opened = False
+        blockquote_depth = 0
 
-        for match in pattern.finditer(html_content):
-            full_tag = match.group(1)   
-            is_closing = bool(match.group(2)) 
-            tag_type = match.group(3).lower() 
+        for match in _FIX_TAG_RE.finditer(html_content):
+            full_tag = match.group(1)
+            is_closing = bool(match.group(2))
+            tag_type = match.group(3).lower()
             start, end = match.span(1)
-            
+
 
             result.append(html_content[last_index:start])
-            
+            last_index = end
+
+            # Unwrap inline tags and paragraphs inside blockquotes
+            if blockquote_depth and tag_type in ('a', 'strong', 'p'):
+                if is_closing and tag_type != 'p':
+                    result.append(' ')
+                continue
+
+            if tag_type in ('a', 'strong'):
+                result.append(full_tag)
+                continue
+
+            if p_opened and not is_closing and tag_type in _P_TRIGGER_TAGS:
+                result.append('</p>')
+                p_opened = False
 
-            if not is_closing and tag_type in ('p', 'figure', 'blockquote') or (not is_closing and tag_type.startswith('h')):
-                if p_opened:
-                    result.append('</p>')
-                    p_opened = False
-            
             result.append(full_tag)
-            
+
             if tag_type == 'p':
                 if is_closing:
                     p_opened = False
                 else:
                     p_opened = True
-
-            last_index = end
+            elif tag_type == 'blockquote':
+                if is_closing:
+                    blockquote_depth = max(blockquote_depth - 1, 0)
+                else:
+                    blockquote_depth += 1
 
         result.append(html_content[last_index:])
         
@@ -634,4 +693,4 @@ class MihanBlockchainScraper(BaseScraper):
                 
             articles.append(processed)
             
-        return articles 
\ No newline at end of file
+        return articles
@@ -1,18 +1,130 @@
+import json
 import logging
+import mimetypes
+import posixpath
+import threading
 import time
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Older Pythons only know .webp when the system mime.types lists it
+mimetypes.add_type('image/webp', '.webp')
+
+def _normalize_images(images: Any) -> Any:
+    """
+    Coerce an imagesUrl value into the list of image objects the API expects.
+    
+    The scrapers already send dictionaries, so that case returns immediately.
+    
+    Args:
+        images: imagesUrl as a list of dictionaries, URL strings or Pydantic models
+        
+    Returns:
+        The list of image dictionaries, or the value unchanged if it needs no conversion
+    """
+    if not isinstance(images, list) or not images or isinstance(images[0], dict):
+        return images
+    
+    if isinstance(images[0], str):
+        # Convert string URLs to proper objects
+        logger.info("Converting imagesUrl from string array to object array")
+        return [
+            {
+                "id": f"img{idx}",
+                "url": image_url,
+                "caption": "",
+                "type": "figure"
+            } for idx, image_url in enumerate(images)
+        ]
+    
+    if callable(getattr(images[0], 'dict', None)):
+        # Convert Pydantic models to dictionaries
+        logger.info("Converting imagesUrl from Pydantic models to dictionaries")
+        return [image.dict() for image in images]
+    
+    return images
+
+class _APIRetry(Retry):
+    """
+    Retry policy that never re-sends a POST the server may already have processed.
+    
+    Read errors are only retried for methods in allowed_methods (GET), and a POST is
+    retried only on statuses that mean the request was turned away unprocessed.
+    Connection errors are retried for every method, since nothing was sent.
+    """
+    POST_RETRY_STATUSES = frozenset({429, 503})
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() == 'POST':
+            return status_code in self.POST_RETRY_STATUSES
+        return super().is_retry(method, status_code, has_retry_after)
+
+class _ImageTooLarge(Exception):
+    """Raised by _LimitedReader when a source image is larger than its limit."""
+
+class _LimitedReader:
+    """
+    File-like wrapper that counts the bytes read from a stream and stops past a limit.
+    
+    It is handed to requests as the multipart file object, so the image is read from
+    the download stream straight into the upload body, with no buffered copy first.
+    """
+    # Bytes requested from the stream per read when the caller asks for everything
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, stream: Any, limit: int):
+        self.stream = stream
+        self.limit = limit
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            chunks = []
+            chunk = self.read(self.CHUNK_SIZE)
+            while chunk:
+                chunks.append(chunk)
+                chunk = self.read(self.CHUNK_SIZE)
+            return b''.join(chunks)
+        
+        # Never ask for more than one byte past the limit
+        chunk = self.stream.read(min(size, self.limit + 1 - self.bytes_read))
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self.limit:
+            raise _ImageTooLarge(f"body exceeds the {self.limit} byte limit")
+        return chunk
+
 class APIClient:
     """
     Client for interacting with the backend API.
     """
+    # (connect, read) timeouts in seconds; image transfers get a longer read window
+    TIMEOUT = (5, 30)
+    IMAGE_TIMEOUT = (5, 60)
+    # Connection errors of any kind (refused, DNS failure, connect timeout) usually mean
+    # the host is down, so stop retrying them early
+    MAX_CONNECT_RETRIES = 3
+    # Upper bound in seconds for the jittered retry backoff
+    MAX_BACKOFF = 30
+    # Transient statuses worth retrying; other 4xx mean the payload or credentials are wrong
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    # Source images larger than this are left on their original host instead of uploaded
+    MAX_IMAGE_BYTES = 5 * 1024 * 1024
+    # How long, in seconds, and how many source URLs known to exist are remembered
+    EXISTS_CACHE_TTL = 3600
+    EXISTS_CACHE_SIZE = 10000
+
     def __init__(
         self, 
         base_url: str = None, 
@@ -35,7 +147,51 @@ class APIClient:
         
         self.api_key = api_key or settings.API_KEY
         self.max_retries = max_retries
+
+        # sourceUrl -> expiry time of URLs the API already stores; only positive answers
+        # are kept, so new articles are still discovered on the next cycle
+        self._exists_cache: "OrderedDict[str, float]" = OrderedDict()
+        self._exists_cache_lock = threading.Lock()
+
+        # Keep-alive pool sized for the scrapers' concurrent image uploads, so each
+        # upload reuses a connection instead of paying a new TCP/TLS handshake.
+        # Only GETs are retried after a read error; see _APIRetry for POST.
+        retry = _APIRetry(
+            total=max_retries,
+            connect=self.MAX_CONNECT_RETRIES,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=0.5,
+            backoff_jitter=0.5,
+            backoff_max=self.MAX_BACKOFF,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({'GET'}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        # Every scraper shares this client, and all of their uploads run on the one
+        # executor below, so the pool only needs to cover IMAGE_UPLOAD_WORKERS
+        pool_size = max(settings.IMAGE_UPLOAD_WORKERS, 10)
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
         self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # Separate session for downloading source images, so the article CDNs keep their
+        # own warm keep-alive pools instead of competing with the API host for slots
+        image_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_size)
+        self.image_session = requests.Session()
+        self.image_session.mount('http://', image_adapter)
+        self.image_session.mount('https://', image_adapter)
+        
+        # Upload threads shared by every upload_images call; created on first use so
+        # clients that never upload start no threads
+        self._upload_executor: Optional[ThreadPoolExecutor] = None
+        self._upload_executor_lock = threading.Lock()
         
         # Setup headers
         self.headers = {
@@ -71,97 +227,74 @@ class APIClient:
             data: The news data to send
             
         Returns:
-            The API response
+            The API response, or {"exists": True} if the article was already stored
             
         Raises:
             RequestException: If the request fails after all retries
         """
         url = self.build_url('/news-posts')
         
-        # Log data summary for debugging
-        data_summary = {
-            "title": data.get('title', 'N/A'),
-            "sourceUrl": data.get('sourceUrl', 'N/A'),
-            "content_length": len(data.get('content', [])) if isinstance(data.get('content', []), list) else 'Not a list',
-            "imagesUrl_count": len(data.get('imagesUrl', [])) if isinstance(data.get('imagesUrl', []), list) else 'Not a list',
-            "tags_count": len(data.get('tags', [])) if isinstance(data.get('tags', []), list) else 'Not a list',
-        }
-        logger.info(f"Preparing to send article: {data_summary}")
+        # Log data summary for debugging; content is a dict of paragraphs, the rest are lists
+        if logger.isEnabledFor(logging.INFO):
+            data_summary = {
+                "title": data.get('title', 'N/A'),
+                "sourceUrl": data.get('sourceUrl', 'N/A'),
+            }
+            for key, label in (('content', 'content_length'), ('imagesUrl', 'imagesUrl_count'), ('tags', 'tags_count')):
+                value = data.get(key, [])
+                data_summary[label] = len(value) if isinstance(value, (list, dict)) else 'Not a list'
+            logger.info(f"Preparing to send article: {data_summary}")
         
         # Ensure imagesUrl is formatted correctly (as array of objects, not strings)
-        images_url = data.get('imagesUrl', [])
-        if isinstance(images_url, list) and len(images_url) > 0:
-            if isinstance(images_url[0], str):
-                # Convert string URLs to proper objects
-                logger.info("Converting imagesUrl from string array to object array")
-                data['imagesUrl'] = [
-                    {
-                        "id": f"img{idx}",
-                        "url": url,
-                        "caption": "",
-                        "type": "figure"
-                    } for idx, url in enumerate(images_url)
-                ]
-            elif hasattr(images_url[0], 'dict') and callable(getattr(images_url[0], 'dict', None)):
-                # Convert Pydantic models to dictionaries
-                logger.info("Converting imagesUrl from Pydantic models to dictionaries")
-                data['imagesUrl'] = [img.dict() for img in images_url]
+        if 'imagesUrl' in data:
+            data['imagesUrl'] = _normalize_images(data['imagesUrl'])
         
-        # Log the complete payload - this is very important for debugging
-        logger.info(f"Complete article payload: {data}")
+        # The complete payload can be tens of KB, so only build it when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Complete article payload: {data}")
         
-        for attempt in range(self.max_retries):
-            try:
-                logger.info(f"Sending data to {url} (Attempt {attempt + 1}/{self.max_retries})")
-                response = self.session.post(
-                    url=url,
-                    json=data,
-                    headers=self.headers
-                )
-                
-                # Log response status
-                logger.info(f"Response status code: {response.status_code}")
-                
-                # If we got an error response but not an exception, log it
-                if response.status_code >= 400:
-                    try:
-                        error_content = response.json()
-                        logger.error(f"Error response from API: {error_content}")
-                    except Exception:
-                        logger.error(f"Error response from API (not JSON): {response.text[:500]}")
-                
-                response.raise_for_status()
-                response_data = response.json()
-                logger.info(f"Successfully sent article: {data.get('title', 'Unknown')} to API, received response: {response_data}")
-                return response_data
-                
-            except RequestException as e:
-                # Log detailed error info
-                logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
-                
-                # Try to extract more detail from the response if available
-                if hasattr(e, 'response') and e.response is not None:
-                    try:
-                        error_content = e.response.json()
-                        logger.error(f"Error details from API: {error_content}")
-                    except Exception:
-                        logger.error(f"Error response (not JSON): {e.response.text[:500] if e.response.text else 'Empty response'}")
-                
-                if attempt == self.max_retries - 1:
-                    logger.error(f"All {self.max_retries} attempts to send article failed: {data.get('title', 'Unknown')}")
-                    
-                    # Log a specific error for articles that fail to post
-                    error_msg = f"⚠️ ARTICLE POST FAILED: '{data.get('title', 'Unknown')}' ({data.get('sourceUrl', 'Unknown')}) - All {self.max_retries} attempts failed"
-                    logger.error(error_msg)
-                    
-                    raise
-                
-                # Exponential backoff before retry
-                sleep_seconds = 2 ** attempt
-                logger.info(f"Waiting {sleep_seconds} seconds before retry...")
-                time.sleep(sleep_seconds)
-                
-        raise RequestException("Failed to send data after all retry attempts")
+        # Serialize once for all attempts. Writing UTF-8 instead of \u escapes also
+        # keeps Persian text at two bytes per character rather than six
+        body = json.dumps(data, ensure_ascii=False, allow_nan=False).encode('utf-8')
+        
+        # Connection failures and 429/503 responses are retried by the session's urllib3
+        # Retry policy; a read timeout is not, since the article may already be stored
+        try:
+            response = self.session.post(
+                url=url,
+                data=body,
+                headers=self.headers,
+                timeout=self.TIMEOUT
+            )
+            
+            # The backend rejects duplicate sourceUrls with 409, so a repeat post is
+            # a no-op rather than a failure
+            if response.status_code == 409:
+                logger.info(f"Article already exists in API: {data.get('sourceUrl', 'Unknown')}")
+                self._remember_existing(data.get('sourceUrl'))
+                return {"exists": True}
+            
+            # If we got an error response but not an exception, log it
+            if response.status_code >= 400:
+                try:
+                    error_content = response.json()
+                    logger.error(f"Error response from API: {error_content}")
+                except Exception:
+                    logger.error(f"Error response from API (not JSON): {response.text[:500]}")
+            
+            response.raise_for_status()
+            response_data = response.json()
+            self._remember_existing(data.get('sourceUrl'))
+            logger.info(f"Successfully sent article: {data.get('title', 'Unknown')} to API (HTTP {response.status_code})")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"API response for {data.get('sourceUrl', 'Unknown')}: {response_data}")
+            return response_data
+            
+        except RequestException as e:
+            # Log a specific error for articles that fail to post
+            error_msg = f"⚠️ ARTICLE POST FAILED: '{data.get('title', 'Unknown')}' ({data.get('sourceUrl', 'Unknown')}) - {e}"
+            logger.error(error_msg)
+            raise
     
     def check_article_exists(self, source_url: str) -> bool:
         """
@@ -173,6 +306,14 @@ class APIClient:
         Returns:
             True if the article exists, False otherwise
         """
+        with self._exists_cache_lock:
+            expires_at = self._exists_cache.get(source_url)
+            if expires_at is not None:
+                if expires_at > time.monotonic():
+                    logger.info(f"Article known to exist (cached): {source_url}")
+                    return True
+                del self._exists_cache[source_url]
+        
         url = self.build_url('/news-posts/check')
         
         try:
@@ -180,7 +321,8 @@ class APIClient:
             response = self.session.post(
                 url=url,
                 json={"sourceUrl": source_url},
-                headers=self.headers
+                headers=self.headers,
+                timeout=self.TIMEOUT
             )
             
             logger.info(f"Check article response status: {response.status_code}")
@@ -189,6 +331,8 @@ class APIClient:
                 result = response.json()
                 exists = result.get('exists', False)
                 logger.info(f"Article exists check result: {exists}")
+                if exists:
+                    self._remember_existing(source_url)
                 return exists
             
             # Log error response
@@ -204,6 +348,16 @@ class APIClient:
             logger.error(f"Error checking if article exists: {e}")
             return False  # Default to false if check fails
     
+    def _remember_existing(self, source_url: Optional[str]) -> None:
+        """Cache that the API stores an article for source_url, for EXISTS_CACHE_TTL seconds."""
+        if not source_url:
+            return
+        with self._exists_cache_lock:
+            self._exists_cache[source_url] = time.monotonic() + self.EXISTS_CACHE_TTL
+            self._exists_cache.move_to_end(source_url)
+            while len(self._exists_cache) > self.EXISTS_CACHE_SIZE:
+                self._exists_cache.popitem(last=False)
+    
     def upload_image(self, image_url: str) -> str:
         """
         Uploads an image to the API and returns the new URL.
@@ -215,38 +369,42 @@ class APIClient:
             The new URL of the uploaded image, or the original URL if upload fails
         """
         try:
-            # Download the image from the original URL
-            response = requests.get(image_url, stream=True)
-            response.raise_for_status()
+            # Download the image from the original URL; the with block hands the
+            # connection back to the pool even when the upload fails
+            with self.image_session.get(image_url, stream=True, timeout=self.IMAGE_TIMEOUT) as response:
+                response.raise_for_status()
+                # Let urllib3 undo gzip/deflate transfer encoding while the body is read
+                response.raw.decode_content = True
 
-            # Determine MIME type based on URL file extension
-            filename = image_url.split('/')[-1]
-            file_ext = filename.split('.')[-1].lower() if '.' in filename else ''
-            
-            # Map common extensions to MIME types
-            mime_types = {
-                'jpg': 'image/jpeg',
-                'jpeg': 'image/jpeg',
-                'png': 'image/png',
-                'gif': 'image/gif',
-                'webp': 'image/webp',
-                'svg': 'image/svg+xml'
-            }
-            
-            # Use the appropriate MIME type or default to image/jpeg
-            mime_type = mime_types.get(file_ext, 'image/jpeg')
-            
-            # API endpoint for image uploads - using just /images since build_url adds /v1
-            url = self.build_url('/images')
-            
-            files = {'file': (filename, response.content, mime_type)}
-            
-            # Use session headers but ensure only the API key is included
-            headers = {'x-api-key': self.api_key} if self.api_key else {}
-            
-            logger.info(f"Uploading image from {image_url}")
-            api_response = requests.post(url, files=files, headers=headers)
-            api_response.raise_for_status()
+                # Skip oversized images before any of the body is read
+                content_length = response.headers.get('Content-Length', '')
+                if content_length.isdigit() and int(content_length) > self.MAX_IMAGE_BYTES:
+                    logger.warning(f"Skipping image {image_url}: {content_length} bytes exceeds the {self.MAX_IMAGE_BYTES} byte limit")
+                    return image_url
+
+                # Name the upload after the URL path, without any query string
+                filename = posixpath.basename(urlparse(image_url).path) or 'image'
+                
+                # Prefer the MIME type the server declared over guessing from the file extension
+                mime_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                if not mime_type.startswith('image/'):
+                    guessed_type = mimetypes.guess_type(filename)[0]
+                    mime_type = guessed_type if guessed_type and guessed_type.startswith('image/') else 'image/jpeg'
+                
+                # API endpoint for image uploads - using just /images since build_url adds /v1
+                url = self.build_url('/images')
+                
+                # Hand the raw stream to requests through a byte-counting wrapper, so the body
+                # goes straight into the upload and responses sent without a Content-Length
+                # are still capped; an oversized body aborts before anything is posted
+                files = {'file': (filename, _LimitedReader(response.raw, self.MAX_IMAGE_BYTES), mime_type)}
+                
+                # Use session headers but ensure only the API key is included
+                headers = {'x-api-key': self.api_key} if self.api_key else {}
+                
+                logger.info(f"Uploading image from {image_url}")
+                api_response = self.session.post(url, files=files, headers=headers, timeout=self.IMAGE_TIMEOUT)
+                api_response.raise_for_status()
 
             # Extract new URL from API response
             response_data = api_response.json()
@@ -257,6 +415,41 @@ class APIClient:
             else:
                 logger.error(f"Invalid response format from file manager: {response_data}")
                 return image_url
-        except RequestException as e:
+        except _ImageTooLarge as e:
+            logger.warning(f"Skipping image {image_url}: {e}")
+            return image_url
+        except (RequestException, Urllib3HTTPError) as e:
+            # Reading response.raw directly surfaces urllib3 errors rather than requests ones
             logger.error(f"Error uploading image {image_url}: {e}")
-            return image_url  # Return original URL if upload fails 
\ No newline at end of file
+            return image_url  # Return original URL if upload fails 
+
+    def upload_images(self, image_urls: List[str]) -> List[str]:
+        """
+        Upload several images concurrently.
+        
+        The images are independent, so they are uploaded on the client's thread pool that
+        shares the keep-alive sessions, instead of paying one round trip after another.
+        Concurrent calls from several scrapers queue on that one pool, so together they
+        never hold more than IMAGE_UPLOAD_WORKERS connections.
+        
+        Args:
+            image_urls: URLs of the images to upload
+            
+        Returns:
+            The new URLs, in the same order as image_urls; failed uploads keep their original URL
+        """
+        if len(image_urls) <= 1:
+            return [self.upload_image(image_url) for image_url in image_urls]
+        
+        return list(self._get_upload_executor().map(self.upload_image, image_urls))
+
+    def _get_upload_executor(self) -> ThreadPoolExecutor:
+        """Return the client's image upload pool, creating it on first use."""
+        if self._upload_executor is None:
+            with self._upload_executor_lock:
+                if self._upload_executor is None:
+                    self._upload_executor = ThreadPoolExecutor(
+                        max_workers=settings.IMAGE_UPLOAD_WORKERS,
+                        thread_name_prefix='image-upload'
+                    )
+        return self._upload_executor
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import json
 from app.scrapers.arzdigital import ArzDigitalScraper
@@ -11,7 +12,44 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def main():
+async def process_article(scraper, article_link, index, total, semaphore):
+    """Fetch and process one article in a worker thread, bounded by the semaphore."""
+    loop = asyncio.get_running_loop()
+    async with semaphore:
+        logger.info(f"Processing article {index}/{total}: {article_link.link}")
+        
+        # Get article content
+        content = await loop.run_in_executor(
+            None, scraper.get_article_content, article_link.link, article_link.date
+        )
+        if not content:
+            logger.warning(f"Failed to get content for article: {article_link.link}")
+            return None
+            
+        # Process article content
+        processed = await loop.run_in_executor(None, scraper.process_article_content, content)
+        if not processed:
+            logger.warning(f"Failed to process content for article: {article_link.link}")
+            return None
+    
+    # Convert to dict
+    article_dict = processed.dict()
+    
+    # Print article info
+    logger.info(f"Article {index}: {article_dict['title']} - {article_dict['sourceUrl']}")
+    return article_dict
+
+async def process_articles(scraper, article_links):
+    """Process all article links concurrently, keeping the listing order."""
+    semaphore = asyncio.Semaphore(settings.FETCH_WORKERS)
+    total = len(article_links)
+    results = await asyncio.gather(*(
+        process_article(scraper, article_link, i + 1, total, semaphore)
+        for i, article_link in enumerate(article_links)
+    ))
+    return [article for article in results if article]
+
+async def main_async():
     """Run a test of the ArzDigital scraper."""
     logger.info("Starting ArzDigital scraper test")
     
@@ -23,41 +61,24 @@ def main():
     logger.info(f"Using URL: {url}")
     
     # Get article links
-    article_links = scraper.get_article_links(url)
+    article_links = await asyncio.get_running_loop().run_in_executor(
+        None, scraper.get_article_links, url
+    )
     logger.info(f"Found {len(article_links)} article links")
     
     # Limit to 3 articles for testing
     article_links = article_links[:3]
     logger.info(f"Processing first 3 articles")
     
-    articles = []
-    
-    # Process each article
-    for i, article_link in enumerate(article_links):
-        logger.info(f"Processing article {i+1}/{len(article_links)}: {article_link.link}")
-        
-        # Get article content
-        content = scraper.get_article_content(article_link.link, article_link.date)
-        if not content:
-            logger.warning(f"Failed to get content for article: {article_link.link}")
-            continue
-            
-        # Process article content
-        processed = scraper.process_article_content(content)
-        if not processed:
-            logger.warning(f"Failed to process content for article: {article_link.link}")
-            continue
-            
-        # Convert to dict
-        article_dict = processed.dict()
-        articles.append(article_dict)
-        
-        # Print article info
-        logger.info(f"Article {i+1}: {article_dict['title']} - {article_dict['sourceUrl']}")
+    articles = await process_articles(scraper, article_links)
     
     # Print json output
     print(json.dumps(articles, ensure_ascii=False, indent=2))
     logger.info(f"Successfully processed {len(articles)} articles")
 
+def main():
+    """Run a test of the ArzDigital scraper."""
+    asyncio.run(main_async())
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,5 +1,5 @@
-import time
 import logging
+import threading
 from datetime import datetime
 from app.core.scheduler import scheduler
 from app.controllers.scraper_controller import scraper_controller
@@ -34,24 +34,27 @@ def main():
     wait_time = 5 * 60  # 5 minutes
     logger.info(f"Waiting for {wait_time} seconds to observe multiple runs...")
     
+    # Park the thread between status reports instead of waking up every second
+    poll_interval = 30
+    stop = threading.Event()
     try:
-        for i in range(wait_time):
-            if i % 30 == 0:  # Log every 30 seconds
-                now = datetime.now()
-                logger.info(f"Still waiting... ({i}/{wait_time} seconds elapsed)")
-                
-                # Get job info
-                jobs = scheduler.scheduler.get_jobs()
-                for job in jobs:
-                    next_run = job.next_run_time
-                    if next_run:
-                        time_diff = next_run - now
-                        logger.info(f"Job {job.id} next run in {time_diff.total_seconds()} seconds")
-                    else:
-                        logger.warning(f"Job {job.id} has no next_run_time (is paused)")
+        for elapsed in range(0, wait_time, poll_interval):
+            logger.info(f"Still waiting... ({elapsed}/{wait_time} seconds elapsed)")
             
-            time.sleep(1)
+            # Get job info
+            jobs = scheduler.scheduler.get_jobs()
+            for job in jobs:
+                next_run = job.next_run_time
+                if next_run:
+                    time_diff = next_run - datetime.now(next_run.tzinfo)
+                    logger.info(f"Job {job.id} next run in {time_diff.total_seconds()} seconds")
+                else:
+                    logger.warning(f"Job {job.id} has no next_run_time (is paused)")
+            
+            if stop.wait(poll_interval):
+                break
     except KeyboardInterrupt:
+        stop.set()
         logger.info("Test interrupted by user")
     
     logger.info("Test completed")
@@ -16,6 +16,48 @@ PERSIAN_MONTHS = {
     'دی': 10, 'بهمن': 11, 'اسفند': 12
 }
 
+# Timezones resolved once instead of on every conversion
+_TEHRAN_TZ = pytz.timezone('Asia/Tehran')
+_UTC = pytz.utc
+
+# Translation table for Persian digits, applied in a single pass
+_PERSIAN_DIGITS_TRANS = str.maketrans('۰۱۲۳۴۵۶۷۸۹', '0123456789')
+
+# Day, Persian month name and year, e.g. '14 مرداد 1402'
+_PERSIAN_DATE_RE = re.compile(r'(\d+)\s+([آ-ی]+)\s+(\d+)')
+
+# Any Persian month name appearing in the text
+_PERSIAN_MONTH_RE = re.compile('|'.join(PERSIAN_MONTHS))
+
+# strptime formats grouped by the shape of the text, so only formats that can
+# match are tried: year first, day first, weekday prefix ('Fri, ...') and month name first
+_YEAR_FIRST_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S')
+_DAY_FIRST_FORMATS = ('%d-%m-%Y', '%d/%m/%Y', '%d %B %Y')
+_WEEKDAY_FIRST_FORMATS = ('%a, %d %b %Y %H:%M:%S',)
+_MONTH_FIRST_FORMATS = ('%B %d, %Y',)
+
+# Alternation of English month names shared by the patterns below
+_ENGLISH_MONTHS_PATTERN = 'January|February|March|April|May|June|July|August|September|October|November|December'
+
+# Date patterns searched for inside free text
+_DATE_PATTERNS = (
+    # YYYY-MM-DD or YYYY/MM/DD
+    re.compile(r'(\d{4})[-/](\d{1,2})[-/](\d{1,2})', re.IGNORECASE),
+    # DD-MM-YYYY or DD/MM/YYYY
+    re.compile(r'(\d{1,2})[-/](\d{1,2})[-/](\d{4})', re.IGNORECASE),
+    # Month DD, YYYY
+    re.compile(rf'({_ENGLISH_MONTHS_PATTERN})\s+(\d{{1,2}}),\s+(\d{{4}})', re.IGNORECASE),
+    # DD Month YYYY
+    re.compile(rf'(\d{{1,2}})\s+({_ENGLISH_MONTHS_PATTERN})\s+(\d{{4}})', re.IGNORECASE),
+)
+
+# Mapping of lowercase English month names to their numerical values
+_ENGLISH_MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4,
+    'may': 5, 'june': 6, 'july': 7, 'august': 8,
+    'september': 9, 'october': 10, 'november': 11, 'december': 12
+}
+
 def persian_to_gregorian(persian_date: str) -> Optional[datetime]:
     """
     Convert a Persian date string to a Gregorian datetime object.
@@ -28,14 +70,10 @@ def persian_to_gregorian(persian_date: str) -> Optional[datetime]:
     """
     try:
         # Convert Persian digits to English digits
-        persian_digits = '۰۱۲۳۴۵۶۷۸۹'
-        english_digits = '0123456789'
-        for p, e in zip(persian_digits, english_digits):
-            persian_date = persian_date.replace(p, e)
+        persian_date = persian_date.translate(_PERSIAN_DIGITS_TRANS)
         
         # Extract day, month, and year using regex
-        pattern = r'(\d+)\s+([آ-ی]+)\s+(\d+)'
-        match = re.search(pattern, persian_date)
+        match = _PERSIAN_DATE_RE.search(persian_date)
         
         if not match:
             logger.warning(f"Could not parse Persian date: {persian_date}")
@@ -55,12 +93,33 @@ def persian_to_gregorian(persian_date: str) -> Optional[datetime]:
         gdate = jdate.togregorian()
         
         # Return as datetime with Tehran timezone
-        tehran_tz = pytz.timezone('Asia/Tehran')
-        return tehran_tz.localize(datetime.combine(gdate, datetime.min.time()))
+        return _TEHRAN_TZ.localize(datetime(gdate.year, gdate.month, gdate.day))
     except Exception as e:
         logger.error(f"Error converting Persian date '{persian_date}': {e}")
         return None
 
+def _candidate_formats(text: str) -> Tuple[str, ...]:
+    """
+    Pick the strptime formats that could match the text, based on its first characters.
+    
+    Args:
+        text: Stripped date text
+        
+    Returns:
+        Tuple of strptime formats to try, possibly empty
+    """
+    if not text:
+        return ()
+    if text[0].isdigit():
+        if len(text) > 4 and text[4] in '-/' and text[:4].isdigit():
+            return _YEAR_FIRST_FORMATS
+        return _DAY_FIRST_FORMATS
+    if text[0].isalpha():
+        if len(text) > 3 and text[3] == ',':
+            return _WEEKDAY_FIRST_FORMATS
+        return _MONTH_FIRST_FORMATS
+    return ()
+
 def extract_date_from_text(text: str) -> Optional[datetime]:
     """
     Extract a date from text using various patterns.
@@ -75,32 +134,16 @@ def extract_date_from_text(text: str) -> Optional[datetime]:
         return None
         
     # Try common date formats
-    formats = [
-        '%Y-%m-%d', '%Y/%m/%d', '%d-%m-%Y', '%d/%m/%Y',
-        '%B %d, %Y', '%d %B %Y', '%Y-%m-%dT%H:%M:%S',
-        '%Y-%m-%d %H:%M:%S', '%a, %d %b %Y %H:%M:%S',
-    ]
-    
-    for fmt in formats:
+    stripped = text.strip()
+    for fmt in _candidate_formats(stripped):
         try:
-            return datetime.strptime(text.strip(), fmt)
+            return datetime.strptime(stripped, fmt)
         except ValueError:
             continue
     
     # Try to extract a date using regex patterns
-    patterns = [
-        # YYYY-MM-DD or YYYY/MM/DD
-        r'(\d{4})[-/](\d{1,2})[-/](\d{1,2})',
-        # DD-MM-YYYY or DD/MM/YYYY
-        r'(\d{1,2})[-/](\d{1,2})[-/](\d{4})',
-        # Month DD, YYYY
-        r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2}),\s+(\d{4})',
-        # DD Month YYYY
-        r'(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _DATE_PATTERNS:
+        match = pattern.search(text)
         if match:
             try:
                 groups = match.groups()
@@ -111,19 +154,14 @@ def extract_date_from_text(text: str) -> Optional[datetime]:
                         if groups[0].isdigit():  # DD-MM-YYYY
                             return datetime(int(groups[2]), int(groups[1]), int(groups[0]))
                         else:  # Month DD, YYYY
-                            month_names = {
-                                'january': 1, 'february': 2, 'march': 3, 'april': 4,
-                                'may': 5, 'june': 6, 'july': 7, 'august': 8,
-                                'september': 9, 'october': 10, 'november': 11, 'december': 12
-                            }
-                            month = month_names.get(groups[0].lower())
+                            month = _ENGLISH_MONTHS.get(groups[0].lower())
                             if month:
                                 return datetime(int(groups[2]), month, int(groups[1]))
             except (ValueError, IndexError):
                 continue
     
     # Check if it's a Persian date
-    if any(month in text for month in PERSIAN_MONTHS.keys()):
+    if _PERSIAN_MONTH_RE.search(text):
         return persian_to_gregorian(text)
     
     return None
@@ -138,7 +176,7 @@ def get_datetime_range(days_ago: int = 7) -> Tuple[datetime, datetime]:
     Returns:
         Tuple of (start_date, end_date)
     """
-    end_date = datetime.now(pytz.utc)
+    end_date = datetime.now(_UTC)
     start_date = end_date - timedelta(days=days_ago)
     return start_date, end_date
 
@@ -178,9 +216,9 @@ def is_recent(dt: datetime, days: int = 7) -> bool:
         
     # Ensure datetime has timezone info
     if dt.tzinfo is None:
-        dt = pytz.utc.localize(dt)
+        dt = _UTC.localize(dt)
         
-    now = datetime.now(pytz.utc)
+    now = datetime.now(_UTC)
     delta = now - dt
     
     return delta.days < days 
\ No newline at end of file
@@ -1,16 +1,65 @@
 import base64
 import io
+import itertools
 import logging
-import re
+import struct
 import requests
 from typing import Optional, Tuple, List, Dict, Any
-from PIL import Image
+from PIL import Image, ImageFile
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Shared keep-alive session, so repeated downloads from the same CDN reuse
+# their connections instead of paying a new TCP/TLS handshake per image
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
+# Bytes fed to the incremental parser per read when probing remote image dimensions
+_PROBE_CHUNK_SIZE = 4096
+
+# Upper bound on how much of a remote image is read while looking for its header
+_PROBE_MAX_BYTES = 256 * 1024
+
+# Signatures and header markers read by _fast_dims
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_JPEG_SOI = b'\xff\xd8'
+# JPEG start-of-frame markers (SOF0-SOF15 except DHT, JPG and DAC), which carry the frame size
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# JPEG markers that stand alone without a length field (TEM, RSTn, SOI, EOI)
+_JPEG_STANDALONE_MARKERS = frozenset([0x01, *range(0xD0, 0xDA)])
+
+# Resampling filters that IMAGE_RESAMPLE may name, and the configured defaults
+_RESAMPLE_FILTERS = {
+    'NEAREST': Image.NEAREST,
+    'BOX': Image.BOX,
+    'BILINEAR': Image.BILINEAR,
+    'HAMMING': Image.HAMMING,
+    'BICUBIC': Image.BICUBIC,
+    'LANCZOS': Image.LANCZOS,
+}
+_DEFAULT_RESAMPLE = _RESAMPLE_FILTERS.get(settings.IMAGE_RESAMPLE.upper(), Image.LANCZOS)
+_DEFAULT_REDUCING_GAP = settings.IMAGE_REDUCING_GAP if settings.IMAGE_REDUCING_GAP > 0 else None
+
+# Largest image body download_image will accept
+_MAX_IMAGE_BYTES = 10 * 1024 * 1024
+
+# User agents rotated across image requests; built once instead of picked per call
+_USER_AGENTS = itertools.cycle(settings.get_user_agents())
+
+# Prefix shared by all base64 image data URLs
+_DATA_URL_PREFIX = 'data:image/'
+
 def is_data_url(url: str) -> bool:
     """
     Check if a URL is a data URL (base64 encoded image).
@@ -21,7 +70,7 @@ def is_data_url(url: str) -> bool:
     Returns:
         True if the URL is a data URL, False otherwise
     """
-    return url.startswith('data:image/')
+    return url.startswith(_DATA_URL_PREFIX)
 
 def extract_from_data_url(data_url: str) -> Tuple[Optional[bytes], Optional[str]]:
     """
@@ -34,13 +83,15 @@ def extract_from_data_url(data_url: str) -> Tuple[Optional[bytes], Optional[str]
         Tuple of (binary data, content type) or (None, None) if extraction fails
     """
     try:
-        pattern = r'data:image/([a-zA-Z]+);base64,(.+)'
-        match = re.match(pattern, data_url)
+        if not data_url.startswith(_DATA_URL_PREFIX):
+            return None, None
         
-        if not match:
+        # Split on the delimiter instead of capturing the (possibly huge) payload with a regex
+        header, separator, base64_data = data_url.partition(';base64,')
+        img_format = header[len(_DATA_URL_PREFIX):]
+        if not separator or not base64_data or not (img_format.isascii() and img_format.isalpha()):
             return None, None
-            
-        img_format, base64_data = match.groups()
+        
         image_data = base64.b64decode(base64_data)
         return image_data, img_format
     except Exception as e:
@@ -63,20 +114,34 @@ def download_image(url: str, timeout: int = 10) -> Optional[bytes]:
         return image_data
         
     try:
-        # Use a random user agent for the request
+        # Rotate through the configured user agents
         headers = {
-            "User-Agent": settings.get_random_user_agent()
+            "User-Agent": next(_USER_AGENTS)
         }
         
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        return response.content
+        # Stream so error pages and oversized bodies are rejected from the headers alone
+        with _SESSION.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            
+            content_length = response.headers.get('Content-Length')
+            if content_length and content_length.isdigit() and int(content_length) > _MAX_IMAGE_BYTES:
+                logger.error(f"Image at {url} is too large ({content_length} bytes)")
+                return None
+            
+            # Read straight from urllib3, one byte past the cap to catch bodies without Content-Length
+            image_data = response.raw.read(_MAX_IMAGE_BYTES + 1, decode_content=True)
+            if len(image_data) > _MAX_IMAGE_BYTES:
+                logger.error(f"Image at {url} is larger than {_MAX_IMAGE_BYTES} bytes")
+                return None
+            return image_data
     except Exception as e:
         logger.error(f"Error downloading image from {url}: {e}")
         return None
 
 def compress_image(image_data: bytes, max_size: int = 1024, 
-                  quality: int = 85, format: str = 'JPEG') -> Optional[bytes]:
+                  quality: int = 85, format: str = 'JPEG',
+                  resample: Optional[int] = None,
+                  reducing_gap: Optional[float] = None) -> Optional[bytes]:
     """
     Compress an image to reduce its file size.
     
@@ -85,6 +150,9 @@ def compress_image(image_data: bytes, max_size: int = 1024,
         max_size: Maximum dimension (width or height) in pixels
         quality: JPEG quality (0-100)
         format: Output format ('JPEG', 'PNG', etc.)
+        resample: Pillow resampling filter, defaults to settings.IMAGE_RESAMPLE
+        reducing_gap: Pre-reduction factor passed to thumbnail, defaults to
+            settings.IMAGE_REDUCING_GAP; 0 disables the pre-reduction
         
     Returns:
         Compressed image data as bytes, or None if compression fails
@@ -92,21 +160,22 @@ def compress_image(image_data: bytes, max_size: int = 1024,
     try:
         img = Image.open(io.BytesIO(image_data))
         
+        # Let libjpeg decode large JPEGs at 1/2, 1/4 or 1/8 scale, never below max_size,
+        # so far fewer pixels are decoded before the final resize
+        if img.format == 'JPEG':
+            img.draft('RGB', (max_size, max_size))
+        
         # Convert to RGB if image has alpha channel (for JPEG)
         if format == 'JPEG' and img.mode == 'RGBA':
             img = img.convert('RGB')
             
-        # Resize if necessary
-        width, height = img.size
-        if width > max_size or height > max_size:
-            if width > height:
-                new_width = max_size
-                new_height = int(height * (max_size / width))
-            else:
-                new_height = max_size
-                new_width = int(width * (max_size / height))
-                
-            img = img.resize((new_width, new_height), Image.LANCZOS)
+        # Resize in place if necessary, keeping the aspect ratio; reducing_gap shrinks
+        # big images with a cheap box reduction before the resampling filter runs
+        if resample is None:
+            resample = _DEFAULT_RESAMPLE
+        if reducing_gap is None:
+            reducing_gap = _DEFAULT_REDUCING_GAP
+        img.thumbnail((max_size, max_size), resample, reducing_gap=reducing_gap or None)
         
         # Save to bytes
         output = io.BytesIO()
@@ -116,6 +185,51 @@ def compress_image(image_data: bytes, max_size: int = 1024,
         logger.error(f"Error compressing image: {e}")
         return None
 
+def _fast_dims(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read the dimensions of a PNG or JPEG straight from its header bytes.
+    
+    Args:
+        data: The image data as bytes
+        
+    Returns:
+        Tuple of (width, height), or None if the data is not a PNG or JPEG
+        whose header could be parsed
+    """
+    if data[:8] == _PNG_SIGNATURE:
+        # IHDR is always the first chunk: width and height follow its type field
+        if data[12:16] == b'IHDR' and len(data) >= 24:
+            return struct.unpack('>II', data[16:24])
+        return None
+    
+    if data[:2] != _JPEG_SOI:
+        return None
+    
+    # Walk the marker segments up to the first start-of-frame
+    view = memoryview(data)
+    offset = 2
+    size = len(data)
+    while offset + 1 < size:
+        if view[offset] != 0xFF:
+            return None
+        marker = view[offset + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            offset += 1
+            continue
+        if marker in _JPEG_STANDALONE_MARKERS:
+            offset += 2
+            continue
+        if offset + 4 > size:
+            return None
+        if marker in _JPEG_SOF_MARKERS:
+            if offset + 9 > size:
+                return None
+            height, width = struct.unpack('>HH', view[offset + 5:offset + 9])
+            return width, height
+        offset += 2 + struct.unpack('>H', view[offset + 2:offset + 4])[0]
+    return None
+
 def get_image_dimensions(image_data: bytes) -> Tuple[Optional[int], Optional[int]]:
     """
     Get the dimensions of an image.
@@ -127,12 +241,61 @@ def get_image_dimensions(image_data: bytes) -> Tuple[Optional[int], Optional[int
         Tuple of (width, height) or (None, None) if getting dimensions fails
     """
     try:
+        # Parse PNG and JPEG headers directly; hand anything else to PIL
+        dims = _fast_dims(image_data)
+        if dims is not None:
+            return dims
+        
         img = Image.open(io.BytesIO(image_data))
         return img.size
     except Exception as e:
         logger.error(f"Error getting image dimensions: {e}")
         return None, None
 
+def get_image_dimensions_from_url(url: str, timeout: int = 10) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Get the dimensions of a remote image without downloading the whole body.
+    
+    The response is streamed into PIL's incremental parser and the connection is
+    released as soon as the header (SOFn for JPEG, IHDR for PNG) has been parsed.
+    
+    Args:
+        url: The URL of the image
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Tuple of (width, height) or (None, None) if getting dimensions fails
+    """
+    if is_data_url(url):
+        image_data, _ = extract_from_data_url(url)
+        return get_image_dimensions(image_data) if image_data else (None, None)
+    
+    try:
+        headers = {
+            "User-Agent": next(_USER_AGENTS)
+        }
+        
+        with _SESSION.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            
+            parser = ImageFile.Parser()
+            read = 0
+            while read < _PROBE_MAX_BYTES:
+                chunk = response.raw.read(_PROBE_CHUNK_SIZE)
+                if not chunk:
+                    break
+                read += len(chunk)
+                parser.feed(chunk)
+                if parser.image is not None:
+                    return parser.image.size
+        
+        logger.error(f"Could not find an image header in the first {read} bytes of {url}")
+        return None, None
+    except Exception as e:
+        logger.error(f"Error getting image dimensions from {url}: {e}")
+        return None, None
+
 def save_image_locally(image_data: bytes, filename: str) -> bool:
     """
     Save an image to the local filesystem.
@@ -0,0 +1,48 @@
+from datetime import date
+
+# Offset between the day count below and date.toordinal()
+_ORDINAL_OFFSET = -356033
+
+def _days_before_year(year: int) -> int:
+    """Day count, on the scale used below, of the day before 1 Farvardin of the given year."""
+    y = year + 1595
+    return 365 * y + (y // 33) * 8 + ((y % 33) + 3) // 4
+
+def is_jalali_leap_year(year: int) -> bool:
+    """
+    Check whether a Jalali year has 366 days, i.e. whether Esfand has a 30th day.
+
+    Args:
+        year: Jalali year (e.g. 1403)
+
+    Returns:
+        True for a leap year, False otherwise
+    """
+    return _days_before_year(year + 1) - _days_before_year(year) == 366
+
+def jalali_to_gregorian(year: int, month: int, day: int) -> date:
+    """
+    Convert a Jalali (Solar Hijri) date to a Gregorian date using plain integer arithmetic.
+
+    Uses the 33-year leap cycle, which agrees with persiantools for years 1300-1499,
+    without building intermediate calendar objects.
+
+    Args:
+        year: Jalali year (e.g. 1403)
+        month: Jalali month number, 1-12
+        day: Day of the month
+
+    Returns:
+        The matching Gregorian date
+
+    Raises:
+        ValueError: If the month or day is out of range
+    """
+    if not 1 <= month <= 12 or not 1 <= day <= (31 if month <= 6 else 30):
+        raise ValueError(f"Invalid Jalali date: {year}-{month}-{day}")
+    if month == 12 and day == 30 and not is_jalali_leap_year(year):
+        raise ValueError(f"Invalid Jalali date: {year}-{month}-{day} (not a leap year)")
+
+    days = _days_before_year(year) + day
+    days += (month - 1) * 31 if month <= 6 else (month - 7) * 30 + 186
+    return date.fromordinal(days + _ORDINAL_OFFSET)
@@ -1,11 +1,94 @@
 import logging
 import re
+import string
+from collections import Counter
+from functools import lru_cache
 from typing import List, Optional
 import unicodedata
 import html
 
 logger = logging.getLogger(__name__)
 
+class _ControlCharTable(dict):
+    """
+    str.translate table that deletes Unicode control-category (C*) characters.
+    
+    Each code point is classified on first sight and cached, so the table only holds
+    characters that have actually appeared instead of all 1.1M code points.
+    """
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        value = None if unicodedata.category(chr(codepoint))[0] == 'C' else codepoint
+        self[codepoint] = value
+        return value
+
+# Shared translate table for clean_text
+_CONTROL_CHARS = _ControlCharTable()
+
+# Prebuilt table for pure-ASCII text, whose only control characters are C0 and DEL
+_ASCII_CONTROL_CHARS = dict.fromkeys([*range(32), 127])
+
+# Runs of whitespace, collapsed to a single space
+_WS_RE = re.compile(r'\s+')
+
+# Words counted by extract_keywords
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# For lowercased ASCII text, blanks out everything \w would not match so str.split
+# yields the same words as _WORD_RE without running the regex engine
+_ASCII_NON_WORD = str.maketrans(dict.fromkeys(
+    (chr(c) for c in range(128) if chr(c) not in string.ascii_lowercase + string.digits + '_'),
+    ' '
+))
+
+# Whitespace that follows a sentence-ending punctuation mark
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Characters dropped from slugs, separators turned into hyphens, and repeated hyphens
+_SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+_SLUG_SEP_RE = re.compile(r'[\s_]')
+_DASH_RE = re.compile(r'-+')
+
+class _SlugCharTable(dict):
+    """
+    str.translate table for generate_slug: drops special characters, turns whitespace
+    and underscores into hyphens and keeps word characters.
+    
+    Like _ControlCharTable, each code point is classified on first sight and cached.
+    """
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        char = chr(codepoint)
+        if _SLUG_STRIP_RE.match(char):
+            value = None
+        elif _SLUG_SEP_RE.match(char):
+            value = ord('-')
+        else:
+            value = codepoint
+        self[codepoint] = value
+        return value
+
+# Shared translate table for generate_slug
+_SLUG_CHARS = _SlugCharTable()
+
+# Phrases stripped by remove_boilerplate when the caller does not pass its own
+_DEFAULT_BOILERPLATE = (
+    "Please enable JavaScript",
+    "cookies are disabled",
+    "Related Articles",
+    "Read more:",
+    "Share this article",
+    "Copyright ©",
+    "All rights reserved",
+    "Subscribe to our newsletter",
+)
+
+@lru_cache(maxsize=32)
+def _boilerplate_pattern(phrases: tuple) -> re.Pattern:
+    """
+    Compile a phrase list into a single case-insensitive alternation.
+    Cached so each distinct phrase list is compiled once.
+    """
+    return re.compile('|'.join(map(re.escape, phrases)), re.IGNORECASE)
+
 def clean_text(text: str) -> str:
     """
     Clean and normalize text content.
@@ -19,17 +102,20 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
         
-    # Unescape HTML entities
+    # Unescape HTML entities (returns the text untouched when there is no '&')
     text = html.unescape(text)
     
-    # Normalize unicode characters
-    text = unicodedata.normalize('NFKC', text)
+    # Normalize unicode characters; pure-ASCII text is already NFKC
+    ascii_only = text.isascii()
+    if not ascii_only:
+        text = unicodedata.normalize('NFKC', text)
     
     # Replace multiple whitespace with a single space
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     
-    # Remove control characters
-    text = ''.join(ch for ch in text if unicodedata.category(ch)[0] != 'C')
+    # Remove control characters; whitespace controls such as newlines were
+    # already turned into spaces above
+    text = text.translate(_ASCII_CONTROL_CHARS if ascii_only else _CONTROL_CHARS)
     
     # Trim whitespace
     text = text.strip()
@@ -54,20 +140,20 @@ def extract_keywords(text: str, min_length: int = 3, max_count: int = 10) -> Lis
     if not text:
         return []
         
-    # Convert to lowercase and split into words
-    words = re.findall(r'\b\w+\b', text.lower())
-    
-    # Filter out short words and count frequency
-    word_counts = {}
-    for word in words:
-        if len(word) >= min_length:
-            word_counts[word] = word_counts.get(word, 0) + 1
-    
-    # Sort by frequency (descending) and take the top N
-    sorted_words = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
-    keywords = [word for word, count in sorted_words[:max_count]]
-    
-    return keywords
+    # Convert to lowercase, split into words and count them in C
+    text = text.lower()
+    if text.isascii():
+        words = text.translate(_ASCII_NON_WORD).split()
+    else:
+        words = _WORD_RE.findall(text)
+    word_counts = Counter(words)
+    
+    # Filter out short words
+    for word in [word for word in word_counts if len(word) < min_length]:
+        del word_counts[word]
+    
+    # Take the top N by frequency; ties keep their first-seen order
+    return [word for word, count in word_counts.most_common(max_count)]
 
 def extract_summary(text: str, max_length: int = 200) -> str:
     """
@@ -94,7 +180,7 @@ def extract_summary(text: str, max_length: int = 200) -> str:
         return clean
     
     # Try to find a sentence boundary near the max_length
-    sentences = re.split(r'(?<=[.!?])\s+', clean)
+    sentences = _SENT_SPLIT_RE.split(clean)
     summary = ""
     
     for sentence in sentences:
@@ -128,14 +214,11 @@ def generate_slug(title: str, max_length: int = 80) -> str:
     # Convert to lowercase and replace spaces with hyphens
     slug = title.lower()
     
-    # Remove special characters
-    slug = re.sub(r'[^\w\s-]', '', slug)
-    
-    # Replace spaces and underscores with hyphens
-    slug = re.sub(r'[\s_]+', '-', slug)
+    # Remove special characters and replace spaces and underscores with hyphens
+    slug = slug.translate(_SLUG_CHARS)
     
     # Remove consecutive hyphens
-    slug = re.sub(r'-+', '-', slug)
+    slug = _DASH_RE.sub('-', slug)
     
     # Trim hyphens from start and end
     slug = slug.strip('-')
@@ -182,24 +265,12 @@ def remove_boilerplate(text: str, boilerplate_phrases: List[str] = None) -> str:
     if not text:
         return ""
     
-    if not boilerplate_phrases:
-        boilerplate_phrases = [
-            "Please enable JavaScript",
-            "cookies are disabled",
-            "Related Articles",
-            "Read more:",
-            "Share this article",
-            "Copyright ©",
-            "All rights reserved",
-            "Subscribe to our newsletter",
-        ]
-    
-    clean = text
-    for phrase in boilerplate_phrases:
-        clean = re.sub(re.escape(phrase), '', clean, flags=re.IGNORECASE)
+    # Remove every phrase in a single pass over the text
+    pattern = _boilerplate_pattern(tuple(boilerplate_phrases or _DEFAULT_BOILERPLATE))
+    clean = pattern.sub('', text)
     
     # Clean up any resulting whitespace issues
-    clean = re.sub(r'\s+', ' ', clean)
+    clean = _WS_RE.sub(' ', clean)
     clean = clean.strip()
     
     return clean 
\ No newline at end of file
@@ -6,6 +6,7 @@ import os
 import sys
 import logging
 import argparse
+import importlib.util
 import uvicorn
 
 # Add parent directory to path to allow imports
@@ -35,6 +36,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logger.info(f"Starting News Scraper API on {args.host}:{args.port}")
 
+# Prefer the libuv event loop and the C HTTP parser; uvloop is POSIX-only, and both
+# fall back to the pure-Python implementations when they are not installed
+loop_impl = "uvloop" if sys.platform != "win32" and importlib.util.find_spec("uvloop") else "asyncio"
+http_impl = "httptools" if importlib.util.find_spec("httptools") else "h11"
+logger.info(f"Using {loop_impl} event loop and {http_impl} HTTP parser")
+
 if __name__ == "__main__":
     # Run the API server
     uvicorn.run(
@@ -44,4 +51,7 @@ if __name__ == "__main__":
         reload=args.reload,
         workers=args.workers,
         log_level=log_level.lower(),
+        loop=loop_impl,
+        http=http_impl,
+        backlog=2048,
     ) 
\ No newline at end of file
@@ -3,47 +3,105 @@
 Simple script to run the scraper directly for testing
 """
 import logging
+import os
 import sys
 import argparse
-
-# Parse command line arguments
-parser = argparse.ArgumentParser(description="Run a specific news scraper")
-parser.add_argument("scraper", type=str, nargs="?", default="mihan_blockchain", 
-                    help="Name of the scraper to run (mihan_blockchain, arzdigital, defier)")
-args = parser.parse_args()
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Configure logging to show detailed output
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format='%(asctime)s - %(name)s - %(processName)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(sys.stdout)
     ]
 )
 
-# Import the scraper controller
-from app.controllers.scraper_controller import ScraperController
+# Import the scrapers directly; the controller module would start the scheduler on import
+from app.core.config import settings
+from app.services.api_client import APIClient
+from app.scrapers.mihan_blockchain import MihanBlockchainScraper
+from app.scrapers.arzdigital import ArzDigitalScraper
+from app.scrapers.defier import DefierScraper
+
+# Scraper class for each news source name
+SCRAPER_CLASSES = {
+    "mihan_blockchain": MihanBlockchainScraper,
+    "arzdigital": ArzDigitalScraper,
+    "defier": DefierScraper,
+}
+
+def _run_one(scraper_name):
+    """
+    Run a single scraper and send its articles to the API.
+    Used as the worker entry point, so each process builds only its own scraper and API client.
+    """
+    api_client = APIClient()
+    scraper = SCRAPER_CLASSES[scraper_name](
+        api_client=api_client,
+        max_age_days=settings.MAX_AGE_DAYS
+    )
+    articles = scraper.run(settings.NEWS_SOURCES[scraper_name]["url"])
+
+    # Send the articles to the API, skipping ones that are already stored
+    successful_articles = []
+    for article in articles:
+        try:
+            response = api_client.post_news_data(article)
+            if isinstance(response, dict) and response.get("exists"):
+                print(f"Article already stored, skipping: {article.get('sourceUrl')}")
+                continue
+            successful_articles.append(article)
+        except Exception as e:
+            print(f"Error: Failed to send article {article.get('sourceUrl')}: {e}")
+
+    return successful_articles
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Run one or more news scrapers")
+    parser.add_argument("scrapers", type=str, nargs="*", default=["mihan_blockchain"],
+                        help="Names of the scrapers to run (mihan_blockchain, arzdigital, defier)")
+    args = parser.parse_args()
+
+    # Validate the requested scrapers against the enabled sources
+    available_scrapers = [name for name in settings.get_enabled_sources() if name in SCRAPER_CLASSES]
+    print(f"Available scrapers: {available_scrapers}")
 
-# Create a controller instance
-print("Creating ScraperController instance...")
-controller = ScraperController()
-print(f"Initialized ScraperController with {len(controller.scrapers)} scrapers")
-print(f"Available scrapers: {list(controller.scrapers.keys())}")
+    scraper_names = list(dict.fromkeys(args.scrapers))
+    for scraper_name in scraper_names:
+        if scraper_name not in available_scrapers:
+            print(f"Error: Scraper '{scraper_name}' not found or not enabled.")
+            print(f"Available scrapers: {available_scrapers}")
+            sys.exit(1)
 
-# Validate the requested scraper
-scraper_name = args.scraper
-if scraper_name not in controller.scrapers:
-    print(f"Error: Scraper '{scraper_name}' not found or not enabled.")
-    print(f"Available scrapers: {list(controller.scrapers.keys())}")
-    sys.exit(1)
+    # Run the selected scrapers; several sources run in parallel worker processes so
+    # their HTML parsing is not serialized on one GIL
+    results = {}
+    if len(scraper_names) == 1:
+        print(f"\nRunning {scraper_names[0]} scraper...")
+        results[scraper_names[0]] = _run_one(scraper_names[0])
+    else:
+        print(f"\nRunning scrapers in parallel: {', '.join(scraper_names)}...")
+        max_workers = min(len(scraper_names), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_run_one, name): name for name in scraper_names}
+            for future in as_completed(futures):
+                scraper_name = futures[future]
+                try:
+                    results[scraper_name] = future.result()
+                except Exception as e:
+                    print(f"Error: Scraper '{scraper_name}' failed: {e}")
+                    results[scraper_name] = []
 
-# Run the selected scraper
-print(f"\nRunning {scraper_name} scraper...")
-results = controller.run_scraper(scraper_name)
+    # Print the results
+    for scraper_name in scraper_names:
+        articles = results[scraper_name]
+        print(f"\n{scraper_name} completed. Processed {len(articles)} articles.")
+        for i, article in enumerate(articles):
+            print(f"Article {i+1}: {article.get('title')} - {article.get('sourceUrl')}")
 
-# Print the results
-print(f"\nScraper completed. Processed {len(results)} articles.")
-for i, article in enumerate(results):
-    print(f"Article {i+1}: {article.get('title')} - {article.get('sourceUrl')}")
+    print("\nDone!")
 
-print("\nDone!") 
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Settings require an API key at import time; tests never reach the real API
+os.environ.setdefault("API_KEY", "test")
+
+# Make the app package importable when running pytest from the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -0,0 +1,196 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from requests.exceptions import HTTPError, ReadTimeout, RequestException
+
+from app.core.config import settings
+from app.services.api_client import APIClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers each request with the next scripted response for its method and path."""
+
+    def _respond(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+        with server.lock:
+            server.requests.append((self.command, self.path, body))
+            script = server.routes[(self.command, self.path)]
+            status, payload = script.pop(0) if len(script) > 1 else script[0]
+        if callable(payload):
+            payload = payload()
+        if isinstance(payload, dict):
+            payload = json.dumps(payload).encode()
+        self.send_response(status)
+        # No Content-Length: the body runs until the connection closes
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    """Local HTTP server; tests fill stub.routes[(method, path)] with (status, body) lists."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.routes = {}
+    server.requests = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(stub):
+    return APIClient(base_url=stub.url, api_key="test")
+
+
+def _count(stub, method, path):
+    return sum(1 for request in stub.requests if request[:2] == (method, path))
+
+
+def test_upload_image_streams_the_source_image(stub, client):
+    image = b"\x89PNG" + bytes(range(256)) * 8
+    stub.routes[("GET", "/img.png")] = [(200, image)]
+    stub.routes[("POST", "/images")] = [(200, {"status": "success", "url": "https://cdn/img.png"})]
+
+    assert client.upload_image(f"{stub.url}/img.png") == "https://cdn/img.png"
+    upload_body = stub.requests[-1][2]
+    assert image in upload_body
+
+
+def test_upload_image_passes_a_stream_not_bytes(stub, client, monkeypatch):
+    stub.routes[("GET", "/img.png")] = [(200, b"image")]
+    stub.routes[("POST", "/images")] = [(200, {"status": "success", "url": "https://cdn/img.png"})]
+    uploaded_files = []
+    post = client.session.post
+
+    def recording_post(url, files=None, **kwargs):
+        uploaded_files.append(files["file"][1])
+        return post(url, files=files, **kwargs)
+
+    monkeypatch.setattr(client.session, "post", recording_post)
+
+    assert client.upload_image(f"{stub.url}/img.png") == "https://cdn/img.png"
+    assert hasattr(uploaded_files[0], "read")
+
+
+@pytest.mark.parametrize("size, uploaded", [(1000, True), (1001, False)])
+def test_upload_image_caps_body_without_content_length(stub, client, size, uploaded):
+    client.MAX_IMAGE_BYTES = 1000
+    stub.routes[("GET", "/big.jpg")] = [(200, b"x" * size)]
+    stub.routes[("POST", "/images")] = [(200, {"status": "success", "url": "https://cdn/big.jpg"})]
+
+    expected = "https://cdn/big.jpg" if uploaded else f"{stub.url}/big.jpg"
+    assert client.upload_image(f"{stub.url}/big.jpg") == expected
+    assert _count(stub, "POST", "/images") == int(uploaded)
+
+
+def test_concurrent_upload_images_share_one_pool(client, monkeypatch):
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def upload_image(image_url):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return f"uploaded:{image_url}"
+
+    monkeypatch.setattr(client, "upload_image", upload_image)
+    urls = [f"https://src/{i}.jpg" for i in range(settings.IMAGE_UPLOAD_WORKERS * 2)]
+    results = []
+    scrapers = [
+        threading.Thread(target=lambda: results.append(client.upload_images(urls)))
+        for _ in range(3)
+    ]
+    for thread in scrapers:
+        thread.start()
+    for thread in scrapers:
+        thread.join()
+
+    assert peak <= settings.IMAGE_UPLOAD_WORKERS
+    assert results == [[f"uploaded:{url}" for url in urls]] * 3
+
+
+@pytest.fixture
+def retry_client(stub, monkeypatch):
+    """APIClient without retry backoff and with a short read timeout."""
+    monkeypatch.setattr(APIClient, "MAX_BACKOFF", 0)
+    client = APIClient(base_url=stub.url, api_key="test", max_retries=3)
+    client.TIMEOUT = (5, 0.3)
+    return client
+
+
+def _slow(body=b"{}"):
+    """Response body that arrives after the client's read timeout."""
+    def payload():
+        time.sleep(0.6)
+        return body
+    return payload
+
+
+def test_post_is_not_retried_after_read_timeout(stub, retry_client):
+    stub.routes[("POST", "/news-posts")] = [(201, _slow())]
+
+    with pytest.raises(ReadTimeout):
+        retry_client.post_news_data({"title": "t", "sourceUrl": "https://src/1"})
+    assert _count(stub, "POST", "/news-posts") == 1
+
+
+def test_get_is_retried_after_read_timeout(stub, retry_client):
+    stub.routes[("GET", "/slow")] = [(200, _slow())]
+
+    with pytest.raises(RequestException):
+        retry_client.session.get(f"{stub.url}/slow", timeout=retry_client.TIMEOUT)
+    assert _count(stub, "GET", "/slow") == 4
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_post_is_retried_on_turned_away_statuses(stub, retry_client, status):
+    stub.routes[("POST", "/news-posts")] = [(status, {}), (status, {}), (201, {"id": 1})]
+
+    assert retry_client.post_news_data({"title": "t", "sourceUrl": "https://src/1"}) == {"id": 1}
+    assert _count(stub, "POST", "/news-posts") == 3
+
+
+@pytest.mark.parametrize("status", [500, 502, 504])
+def test_post_is_not_retried_on_other_server_errors(stub, retry_client, status):
+    stub.routes[("POST", "/news-posts")] = [(status, {}), (201, {"id": 1})]
+
+    with pytest.raises(HTTPError):
+        retry_client.post_news_data({"title": "t", "sourceUrl": "https://src/1"})
+    assert _count(stub, "POST", "/news-posts") == 1
+
+
+def test_post_gives_up_after_max_retries(stub, retry_client):
+    stub.routes[("POST", "/news-posts")] = [(503, {})]
+
+    with pytest.raises(HTTPError):
+        retry_client.post_news_data({"title": "t", "sourceUrl": "https://src/1"})
+    assert _count(stub, "POST", "/news-posts") == 4
+
+
+def test_conflict_means_article_exists(stub, retry_client):
+    stub.routes[("POST", "/news-posts")] = [(409, {"message": "duplicate"})]
+
+    assert retry_client.post_news_data({"title": "t", "sourceUrl": "https://src/1"}) == {"exists": True}
+    assert _count(stub, "POST", "/news-posts") == 1
+    assert retry_client.check_article_exists("https://src/1") is True
@@ -0,0 +1,62 @@
+import io
+
+import pytest
+from PIL import Image
+
+from app.utils.image_utils import _fast_dims
+
+
+def _encode(format, **save_options):
+    """Encode a 37x23 test image; distinct sides catch a swapped width and height."""
+    img = Image.new("RGB", (37, 23), (200, 40, 90))
+    output = io.BytesIO()
+    img.save(output, format=format, **save_options)
+    return output.getvalue()
+
+
+def _exif():
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"
+    exif[0x0110] = "Camera model"
+    return exif.tobytes()
+
+
+IMAGES = {
+    "png": _encode("PNG"),
+    "baseline_jpeg": _encode("JPEG"),
+    "progressive_jpeg": _encode("JPEG", progressive=True),
+    "jpeg_with_exif": _encode("JPEG", exif=_exif()),
+}
+
+
+@pytest.mark.parametrize("name", IMAGES)
+def test_fast_dims_matches_pillow(name):
+    data = IMAGES[name]
+
+    assert _fast_dims(data) == Image.open(io.BytesIO(data)).size
+
+
+def test_exif_segment_comes_before_the_frame_header():
+    data = IMAGES["jpeg_with_exif"]
+
+    assert data.index(b"\xff\xe1") < data.index(b"\xff\xc0")
+
+
+@pytest.mark.parametrize("name, length", [
+    ("png", 20),
+    ("baseline_jpeg", 2),
+    ("jpeg_with_exif", 30),
+    ("progressive_jpeg", IMAGES["progressive_jpeg"].index(b"\xff\xc2") + 6),
+])
+def test_fast_dims_truncated_header(name, length):
+    assert _fast_dims(IMAGES[name][:length]) is None
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"not an image at all",
+    _encode("GIF"),
+    b"\xff\xd8" + b"\x00" * 32,
+])
+def test_fast_dims_non_image(data):
+    assert _fast_dims(data) is None
@@ -0,0 +1,27 @@
+from datetime import date
+
+import pytest
+
+from app.utils.jalali import is_jalali_leap_year, jalali_to_gregorian
+
+
+def test_converts_to_gregorian():
+    assert jalali_to_gregorian(1403, 1, 1) == date(2024, 3, 20)
+    assert jalali_to_gregorian(1402, 12, 29) == date(2024, 3, 19)
+
+
+def test_esfand_30_in_leap_year():
+    assert is_jalali_leap_year(1403)
+    assert jalali_to_gregorian(1403, 12, 30) == date(2025, 3, 20)
+
+
+def test_esfand_30_in_non_leap_year_is_rejected():
+    assert not is_jalali_leap_year(1402)
+    with pytest.raises(ValueError):
+        jalali_to_gregorian(1402, 12, 30)
+
+
+@pytest.mark.parametrize("month, day", [(0, 1), (13, 1), (1, 0), (1, 32), (7, 31)])
+def test_out_of_range_dates_are_rejected(month, day):
+    with pytest.raises(ValueError):
+        jalali_to_gregorian(1403, month, day)
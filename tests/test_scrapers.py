@@ -0,0 +1,108 @@
+import pytest
+
+from app.scrapers.arzdigital import ArzDigitalScraper
+from app.scrapers.defier import DefierScraper
+from app.scrapers.mihan_blockchain import MihanBlockchainScraper
+
+
+class FakeAPIClient:
+    """Stands in for APIClient: images "upload" to a predictable URL."""
+
+    def upload_image(self, image_url):
+        return f"uploaded:{image_url}"
+
+    def upload_images(self, image_urls):
+        return [self.upload_image(url) for url in image_urls]
+
+    def check_article_exists(self, source_url):
+        return False
+
+
+def _serve(scraper, html):
+    """Make every page fetch of the scraper return the given HTML."""
+    scraper.get_html = lambda url: html
+    return scraper
+
+
+MIHAN_ARTICLE = """
+<html><body>
+<div class="jeg_inner_content">
+  <div class="entry-header"><h1 class="jeg_post_title">Title</h1></div>
+  <div class="entry-content">
+    <div class="article-content">
+      <p>one</p>
+      <p>four <div>inner</div> after</p>
+      <p>five</p>
+    </div>
+  </div>
+</div>
+</body></html>
+"""
+
+
+@pytest.fixture
+def mihan():
+    return _serve(MihanBlockchainScraper(api_client=FakeAPIClient()), MIHAN_ARTICLE)
+
+
+def test_mihan_keeps_text_of_div_nested_in_paragraph(mihan):
+    content = mihan.get_article_content("https://mihanblockchain.com/post/", "2024-01-01")
+    article = mihan.process_article_content(content)
+
+    assert article.content == {"p0": "one", "p1": "four inner after", "p2": "five"}
+
+
+ARZDIGITAL_ARTICLE = """
+<html><body>
+<section class="arz-container arz-breaking-news-post">
+  <header><h1 class="arz-breaking-news-post__title">Title</h1></header>
+  <article>
+    <section>
+      <div class="arz-post__content">
+        <p>one</p>
+        <p>four <div>inner</div> after</p>
+        <p>five</p>
+      </div>
+    </section>
+  </article>
+</section>
+</body></html>
+"""
+
+DEFIER_ARTICLE = """
+<html><body>
+<section class="elementor-section"><div class="elementor-container"><div class="elementor-column">
+<div class="elementor-widget-wrap">
+<section class="elementor-section"><div class="elementor-container"><div class="elementor-column">
+<div class="elementor-widget-wrap">
+  <p>one</p>
+  <p>four <div>inner</div> after</p>
+  <p>five</p>
+</div>
+</div></div></section>
+</div>
+</div></div></section>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("scraper_class, html", [
+    (ArzDigitalScraper, ARZDIGITAL_ARTICLE),
+    (DefierScraper, DEFIER_ARTICLE),
+], ids=["arzdigital", "defier"])
+def test_keeps_text_of_div_nested_in_paragraph(scraper_class, html):
+    scraper = _serve(scraper_class(api_client=FakeAPIClient()), html)
+
+    content = scraper.get_article_content("https://example.com/post/", "2024-01-01")
+    article = scraper.process_article_content(content)
+
+    assert article.content == {"p0": "one", "p1": "four inner after", "p2": "five"}
+
+
+@pytest.mark.parametrize("scraper_class", [ArzDigitalScraper, DefierScraper], ids=["arzdigital", "defier"])
+def test_extract_content_keeps_text_of_div_nested_in_paragraph(scraper_class):
+    scraper = scraper_class(api_client=FakeAPIClient())
+
+    content = scraper.extract_content("<p>four <div>inner</div> after</p>")
+
+    assert content == {"p0": "four inner after"}
@@ -0,0 +1,86 @@
+import re
+from collections import Counter
+
+import pytest
+
+from app.utils.text_utils import extract_keywords, generate_slug
+
+
+def _regex_slug(title, max_length=80):
+    """generate_slug as it was before the translate table, kept as the reference."""
+    if not title:
+        return ""
+    slug = title.lower()
+    slug = re.sub(r'[^\w\s-]', '', slug)
+    slug = re.sub(r'[\s_]+', '-', slug)
+    slug = re.sub(r'-+', '-', slug)
+    slug = slug.strip('-')
+    if len(slug) > max_length:
+        slug = slug[:max_length].rsplit('-', 1)[0]
+    return slug
+
+
+def _regex_keywords(text, min_length=3, max_count=10):
+    """extract_keywords as it was before the ASCII tokenizer, kept as the reference."""
+    if not text:
+        return []
+    word_counts = Counter(re.findall(r'\b\w+\b', text.lower()))
+    for word in [word for word in word_counts if len(word) < min_length]:
+        del word_counts[word]
+    return [word for word, count in word_counts.most_common(max_count)]
+
+
+TITLES = [
+    "قیمت بیت‌کوین امروز ۲۵ اسفند ۱۴۰۳؛ رکورد جدید؟",
+    "تحلیل «اتریوم» در بازار: صعود یا نزول!",
+    "Bitcoin (BTC) به ۱۰۰ هزار دلار رسید",
+    "ETF های اسپات Ethereum تایید شدند - SEC",
+    "snake_case__and___underscores",
+    "under_score و فاصله_فارسی",
+    "Wow!!! ... price -- up ??? $$$ 100%",
+    "  --__ leading and trailing __--  ",
+    "—–-- em dash, en dash and hyphens --–—",
+    "!!!؟؟؟",
+    "Café déjà vu ÆØÅ",
+    "a" * 50 + " " + "ب" * 50,
+    "",
+]
+
+
+@pytest.mark.parametrize("title", TITLES)
+def test_generate_slug_matches_regex_version(title):
+    assert generate_slug(title) == _regex_slug(title)
+
+
+@pytest.mark.parametrize("title", TITLES)
+def test_generate_slug_matches_regex_version_when_truncated(title):
+    assert generate_slug(title, max_length=12) == _regex_slug(title, max_length=12)
+
+
+def test_generate_slug_persian_title():
+    assert generate_slug("قیمت بیت‌کوین امروز؛ رکورد جدید؟") == "قیمت-بیتکوین-امروز-رکورد-جدید"
+
+
+TEXTS = [
+    "بیت کوین و اتریوم امروز رشد کردند. بیت کوین به رکورد رسید و اتریوم هم رشد کرد.",
+    "Bitcoin و Ethereum در بازار؛ bitcoin ETF و ethereum ETF تایید شد، BTC به ۱۰۰ هزار رسید.",
+    "قیمت‌ها، نمودار‌ها و تحلیل‌ها: قیمت‌ها بالا رفت؟ تحلیل‌ها می‌گویند بله!",
+    "Bitcoin hits $100,000; bitcoin ETF inflows rise. ETF demand, BTC_USD and btc-usd pairs up 5%!",
+    "snake_case words, don't split-hyphenated co-op e-mail #tags @handles 2024-01-01",
+    "The the THE tHe quick quick fox fox fox a an to of",
+    "Café déjà vu, café crème",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_extract_keywords_matches_regex_version(text):
+    assert extract_keywords(text) == _regex_keywords(text)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_extract_keywords_matches_regex_version_with_options(text):
+    assert extract_keywords(text, min_length=2, max_count=3) == _regex_keywords(text, min_length=2, max_count=3)
+
+
+def test_extract_keywords_persian_text():
+    assert extract_keywords(TEXTS[0], max_count=2) == ["بیت", "کوین"]